@@ -0,0 +1,186 @@
+"""
+Scripted offline stand-ins for the LLM providers and Tavily.
+
+The fakes recognise which node is calling them from the rendered prompt and
+return well-formed responses for it, sleeping for a latency drawn from a
+configurable distribution so orchestration overhead can be measured without
+network access.
+"""
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+from typing import Any, List, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class LatencyModel:
+    """
+    Samples simulated latencies in seconds.
+    
+    Spec format: "fixed:<s>", "uniform:<low>,<high>" or "lognormal:<median>,<sigma>".
+    """
+    
+    def __init__(self, spec: str = "fixed:0", seed: int = 0):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p]
+        self._rng = random.Random(seed)
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unsupported latency distribution: {spec}")
+    
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.params[0] if self.params else 0.0
+        if self.kind == "uniform":
+            return self._rng.uniform(self.params[0], self.params[1])
+        median, sigma = self.params
+        return self._rng.lognormvariate(0, sigma) * median
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:8]
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers planning, synthesis, citation and subagent prompts."""
+    
+    latency: Any = None
+    # Extra seconds per 1k prompt characters, so long prompts cost more (like prefill)
+    latency_per_1k_chars: float = 0.0
+    subagents: int = 3
+    searches_per_subagent: int = 2
+    
+    @property
+    def _llm_type(self) -> str:
+        return "fake-research"
+    
+    def bind_tools(self, tools: Any, **kwargs: Any):
+        return self
+    
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        text = "\n".join(str(m.content) for m in messages)
+        usage = {"input_tokens": len(text) // 4, "output_tokens": 0, "total_tokens": len(text) // 4}
+        
+        if "Lead Research Agent" in text:
+            content = json.dumps({
+                "query_complexity": "moderate",
+                "estimated_subagents": self.subagents,
+                "strategy": "Split the question into independent facets and research each.",
+                "subagent_tasks": [self._task(n) for n in range(self.subagents)]
+            })
+        elif "synthesizing research findings" in text:
+            content = json.dumps({
+                "synthesis": "Synthesis: " + "Findings agree. " * 20,
+                "gaps": [],
+                "contradictions": [],
+                "needs_more_research": False,
+                "reason": "Scripted benchmark run",
+                "next_tasks": []
+            })
+        elif "Citation Agent" in text:
+            content = json.dumps({
+                "report": "# Report\n\n" + "A cited claim [1]. " * 50,
+                "citations_used": [1, 2, 3]
+            })
+        else:
+            tool_messages = [m for m in messages if isinstance(m, ToolMessage)]
+            # A subagent stopped by its budget gets a tool-free transcript and must answer
+            forced = "budget is exhausted" in text
+            if not forced and len(tool_messages) < self.searches_per_subagent:
+                return self._tool_call(messages, len(tool_messages), usage)
+            gathered = text if forced else "\n".join(str(m.content) for m in tool_messages)
+            urls = re.findall(r"https://[^\s\"'\\\\,]+", gathered)
+            content = json.dumps({
+                "findings": "Scripted findings. " * 30,
+                "sources": [
+                    {"url": url, "title": f"Source {url[-8:]}", "snippet": "Relevant excerpt.", "score": 0.8}
+                    for url in dict.fromkeys(urls)
+                ][:8],
+                "confidence": 0.8,
+                "gaps": []
+            })
+        
+        usage["output_tokens"] = len(content) // 4
+        usage["total_tokens"] += usage["output_tokens"]
+        return AIMessage(content=content, usage_metadata=usage)
+    
+    def _task(self, n: int) -> dict:
+        return {
+            "task_id": f"task{n}",
+            "objective": f"Investigate facet {n}",
+            "search_strategy": "broad",
+            "output_format": "Bullet points",
+            "tool_guidance": "search_web_with_sources, deep_search_web",
+            "boundaries": f"Only facet {n}"
+        }
+    
+    def _tool_call(self, messages: List[BaseMessage], step: int, usage: dict) -> AIMessage:
+        task = next(str(m.content) for m in messages if m.type == "human")
+        seed = _digest(f"{task} {step}")
+        if step % 2 == 0:
+            call = {"name": "search_web_with_sources", "args": {"query": f"topic {seed} step {step}"}}
+        else:
+            call = {"name": "deep_search_web", "args": {"query": f"deep {seed}", "follow_up_queries": [f"lead {seed} a", f"lead {seed} b"]}}
+        call.update({"id": f"call_{seed}_{step}", "type": "tool_call"})
+        return AIMessage(content="", tool_calls=[call], usage_metadata=usage)
+    
+    def _delay(self, messages: List[BaseMessage]) -> float:
+        delay = self.latency.sample() if self.latency is not None else 0.0
+        chars = sum(len(str(m.content)) for m in messages)
+        return delay + self.latency_per_1k_chars * chars / 1000
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self._delay(messages))
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+    
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self._delay(messages))
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+
+def _fake_search_response(query: str, max_results: Optional[int] = None, include_answer: bool = False) -> dict:
+    seed = _digest(query)
+    results = [
+        {
+            "title": f"Result {n} for {query}",
+            "url": f"https://example.com/{seed}/{n}",
+            "content": f"Content about {query}. However, details vary by source. " * 3,
+            "score": round(1 - n / 20, 3)
+        }
+        for n in range(max_results or 5)
+    ]
+    return {"query": query, "answer": f"Summary of {query}" if include_answer else None, "results": results}
+
+
+class FakeTavilyClient:
+    """Synchronous stand-in for TavilyClient.search."""
+    
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        self.latency = latency
+        self.calls = 0
+    
+    def search(self, query: str, max_results: Optional[int] = None, include_answer: bool = False, **kwargs) -> dict:
+        self.calls += 1
+        if self.latency is not None:
+            time.sleep(self.latency.sample())
+        return _fake_search_response(query, max_results, include_answer)
+
+
+class FakeAsyncTavilyClient:
+    """Asynchronous stand-in for AsyncTavilyClient.search."""
+    
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        self.latency = latency
+        self.calls = 0
+    
+    async def search(self, query: str, max_results: Optional[int] = None, include_answer: bool = False, **kwargs) -> dict:
+        self.calls += 1
+        if self.latency is not None:
+            await asyncio.sleep(self.latency.sample())
+        return _fake_search_response(query, max_results, include_answer)
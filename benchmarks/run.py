@@ -0,0 +1,261 @@
+"""
+Offline end-to-end benchmark for the research graph.
+
+Swaps get_llm and the Tavily clients for the scripted fakes in
+benchmarks.fakes, runs canned queries through build_graph() and reports
+wall-clock, per-node latency and tokens, peak memory and bytes written.
+
+Per-node latency is wall-clock: for nodes fanned out with Send (one
+"subagent" task per SubagentTask) it is the time from the first task's
+start to the last one's end in each superstep, summed over supersteps.
+The summed time of the individual tasks is reported separately as
+node_busy_s, with the task count, mean and max.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --subagents 8 --llm-latency lognormal:0.2,0.5 --json report.json
+    python -m benchmarks.run --subagents 8 --llm-latency lognormal:0.2,0.5 --stream
+    python -m benchmarks.run --max-wall-clock 5   # exit 1 if any query is slower
+"""
+import os
+import sys
+import asyncio
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+from benchmarks.fakes import FakeChatModel, FakeTavilyClient, FakeAsyncTavilyClient, LatencyModel
+from src.utils.instrumentation import configure_tracing, get_metrics
+
+CANNED_QUERIES = [
+    "Compare the economics of grid-scale battery storage technologies",
+    "What are the main open problems in protein structure prediction?",
+    "How have remote work policies changed commercial real estate since 2020?",
+]
+
+# Modules that import get_llm by name and therefore need patching individually
+LLM_PATCH_TARGETS = [
+    "src.agents.lead_researcher",
+    "src.agents.subagent",
+    "src.agents.citation_agent",
+]
+
+
+def install_fakes(args) -> Dict[str, object]:
+    """Point every LLM and Tavily entry point at the scripted fakes."""
+    import importlib
+    import src.tools.search as search
+
+    fake_model = FakeChatModel(
+        latency=LatencyModel(args.llm_latency, seed=args.seed),
+        latency_per_1k_chars=args.llm_latency_per_1k,
+        subagents=args.subagents,
+        searches_per_subagent=args.searches
+    )
+
+    from src.utils.llm_cache import get_llm_cache, get_semantic_llm_cache
+    cached_models = {}
+
+    def fake_get_llm(provider: str = "openai", model: str = None, temperature: float = 0.7,
+                     use_cache: bool = False, semantic_cache: bool = False, **kwargs):
+        # Mirror get_llm's cache selection so --caches measures the LLM caches too
+        cache = None
+        if use_cache:
+            cache = get_semantic_llm_cache() if semantic_cache else get_llm_cache()
+        if cache is None:
+            return fake_model
+        if id(cache) not in cached_models:
+            cached_models[id(cache)] = fake_model.model_copy(update={"cache": cache})
+        return cached_models[id(cache)]
+
+    for name in LLM_PATCH_TARGETS:
+        importlib.import_module(name).get_llm = fake_get_llm
+
+    sync_client = FakeTavilyClient(LatencyModel(args.search_latency, seed=args.seed + 1))
+    async_client = FakeAsyncTavilyClient(LatencyModel(args.search_latency, seed=args.seed + 2))
+    search.get_tavily_client = lambda: sync_client
+    search.get_async_tavily_client = lambda: async_client
+
+    return {"model": fake_model, "sync_search": sync_client, "async_search": async_client}
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+async def run_query(graph, query: str, conversation_id: str, output_dir: str, fakes: Dict[str, object],
+                    stream_results: bool = False) -> dict:
+    """Run one query through the graph and collect its measurements."""
+    from src.graph.workflow import get_initial_state
+
+    state = get_initial_state(query, conversation_id, output_dir=output_dir)
+    state["stream_results"] = stream_results
+    searches_before = fakes["sync_search"].calls + fakes["async_search"].calls
+    metrics = get_metrics()
+    metrics.reset()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    config = {"max_concurrency": state["max_concurrency"], "configurable": {"thread_id": conversation_id}}
+    # (node, superstep) -> [first task start, last task end]; the debug stream reports both
+    steps: Dict[tuple, List[float]] = {}
+    async for event in graph.astream(state, config=config, stream_mode="debug"):
+        if event["type"] in ("task", "task_result"):
+            at = datetime.fromisoformat(event["timestamp"]).timestamp()
+            bounds = steps.setdefault((event["payload"]["name"], event["step"]), [at, at])
+            bounds[0], bounds[1] = min(bounds[0], at), max(bounds[1], at)
+    wall_clock = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    node_latency: Dict[str, float] = defaultdict(float)
+    for (name, _), (first, last) in steps.items():
+        node_latency[name] += last - first
+
+    # Summed task time comes from the instrumentation spans wrapped around each node
+    snapshot = metrics.snapshot()
+    node_busy = {
+        name[len("node."):-len(".latency_s")]: {
+            "sum": round(histogram["sum"], 4),
+            "count": histogram["count"],
+            "mean": round(histogram["mean"], 4),
+            "max": round(histogram["max"], 4),
+        }
+        for name, histogram in snapshot["histograms"].items()
+        if name.startswith("node.") and name.endswith(".latency_s") and histogram["count"]
+    }
+    counters = snapshot["counters"]
+
+    return {
+        "query": query,
+        "wall_clock_s": round(wall_clock, 4),
+        "node_latency_s": {name: round(value, 4) for name, value in node_latency.items()},
+        "node_busy_s": node_busy,
+        "tokens_in": int(sum(v for k, v in counters.items() if k.startswith("node.") and k.endswith(".tokens_in"))),
+        "tokens_out": int(sum(v for k, v in counters.items() if k.startswith("node.") and k.endswith(".tokens_out"))),
+        "peak_memory_bytes": peak,
+        "bytes_written": _dir_size(output_dir),
+        "search_calls": fakes["sync_search"].calls + fakes["async_search"].calls - searches_before,
+    }
+
+
+async def run_all(args, workdir: str, fakes: Dict[str, object]) -> List[dict]:
+    """Run every canned query args.repeat times, one after another on one event loop."""
+    from src.graph.workflow import build_graph
+    from src.utils.checkpoint import open_checkpointer
+
+    if not args.checkpoint:
+        os.environ["RESEARCH_CHECKPOINT_DISABLED"] = "1"
+    runs = []
+    async with open_checkpointer(os.path.join(workdir, "checkpoints.sqlite")) as checkpointer:
+        graph = build_graph(checkpointer=checkpointer)
+        for n in range(args.repeat):
+            for q, query in enumerate(CANNED_QUERIES):
+                conversation_id = f"bench{n}_{q}"
+                output_dir = os.path.join(workdir, conversation_id)
+                run = await run_query(graph, query, conversation_id, output_dir, fakes, args.stream)
+                runs.append(run)
+                print(f"{conversation_id}: {run['wall_clock_s']:.3f}s  {run['node_latency_s']}")
+    return runs
+
+
+def summarize(runs: List[dict]) -> dict:
+    """Aggregate per-run measurements."""
+    wall = sorted(run["wall_clock_s"] for run in runs)
+    nodes: Dict[str, List[float]] = defaultdict(list)
+    busy: Dict[str, List[float]] = defaultdict(list)
+    for run in runs:
+        for name, value in run["node_latency_s"].items():
+            nodes[name].append(value)
+        for name, value in run["node_busy_s"].items():
+            busy[name].append(value["sum"])
+
+    return {
+        "runs": len(runs),
+        "wall_clock_s": {
+            "total": round(sum(wall), 4),
+            "mean": round(sum(wall) / len(wall), 4),
+            "max": wall[-1],
+        },
+        "node_latency_mean_s": {name: round(sum(v) / len(v), 4) for name, v in nodes.items()},
+        "node_busy_sum_mean_s": {name: round(sum(v) / len(v), 4) for name, v in busy.items()},
+        "peak_memory_bytes": max(run["peak_memory_bytes"] for run in runs),
+        "bytes_written": sum(run["bytes_written"] for run in runs),
+        "tokens_in": sum(run["tokens_in"] for run in runs),
+        "tokens_out": sum(run["tokens_out"] for run in runs),
+        "search_calls": sum(run["search_calls"] for run in runs),
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark for the research graph")
+    parser.add_argument("--repeat", type=int, default=1, help="Times to run each canned query")
+    parser.add_argument("--subagents", type=int, default=3, help="Subagents per research plan")
+    parser.add_argument("--searches", type=int, default=2, help="Tool calls per subagent")
+    parser.add_argument("--llm-latency", default="fixed:0.05", help="LLM latency distribution")
+    parser.add_argument("--llm-latency-per-1k", type=float, default=0.0,
+                        help="Extra LLM latency in seconds per 1k prompt characters")
+    parser.add_argument("--search-latency", default="fixed:0.02", help="Search latency distribution")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for latency sampling")
+    parser.add_argument("--stream", action="store_true",
+                        help="Process subagent results as they complete (incremental synthesis)")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="Checkpoint every step to SQLite (in the temporary directory)")
+    parser.add_argument("--caches", action="store_true",
+                        help="Keep the search and LLM caches enabled (in a temporary directory)")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument("--trace", help="Also write instrumentation spans to this JSONL file")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated research output")
+    parser.add_argument("--max-wall-clock", type=float,
+                        help="Fail if any single query takes longer than this many seconds")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="research-bench-")
+    if args.caches:
+        os.environ["SEARCH_CACHE_PATH"] = os.path.join(workdir, "search_cache.sqlite")
+        os.environ["LLM_CACHE_PATH"] = os.path.join(workdir, "llm_cache.sqlite")
+        os.environ["LLM_SEMANTIC_CACHE_PATH"] = os.path.join(workdir, "llm_semantic_cache.sqlite")
+    else:
+        os.environ["SEARCH_CACHE_DISABLED"] = "1"
+        os.environ["LLM_CACHE_DISABLED"] = "1"
+    os.environ.setdefault("TAVILY_API_KEY", "offline-benchmark")
+
+    fakes = install_fakes(args)
+    configure_tracing(args.trace)
+
+    runs = asyncio.run(run_all(args, workdir, fakes))
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("json", "trace")},
+        "runs": runs,
+        "summary": summarize(runs),
+    }
+    print(json.dumps(report["summary"], indent=2))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.keep:
+        print(f"Output kept in {workdir}")
+    else:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.max_wall_clock is not None and report["summary"]["wall_clock_s"]["max"] > args.max_wall_clock:
+        print(f"FAIL: slowest query exceeded {args.max_wall_clock}s", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
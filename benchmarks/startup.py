@@ -0,0 +1,100 @@
+"""
+Import-time benchmark for the command-line entry points.
+
+Runs each entry module under `python -X importtime` in a fresh interpreter
+and reports how long its own imports take, excluding what the interpreter
+loads at startup anyway (site, .pth hooks). The entry points must not pull
+in the graph or any SDK before argument parsing, so importing one of the
+HEAVY_MODULES is a failure regardless of time.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --max-import-ms 150 --repeat 5
+"""
+import sys
+import json
+import argparse
+import subprocess
+from typing import Dict, List
+
+# Entry modules whose import must stay light (what `research --help` pays)
+ENTRY_MODULES = ["src.main", "src.server"]
+
+# Loaded lazily once a run starts; informational only
+RUNTIME_MODULES = ["src.graph.workflow"]
+
+HEAVY_MODULES = [
+    "langgraph",
+    "langchain_core",
+    "langchain_openai",
+    "langchain_anthropic",
+    "langchain_google_genai",
+    "tavily",
+    "pydantic",
+    "aiosqlite",
+]
+
+
+def import_profile(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of every module imported by `import module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def measure(module: str, repeat: int) -> dict:
+    """Best-of-repeat import time for module, plus any heavy modules it loaded."""
+    timings = []
+    heavy = set()
+    for _ in range(repeat):
+        profile = import_profile(module)
+        timings.append(profile.get(module, 0))
+        heavy.update(name for name in profile if name.split(".")[0] in HEAVY_MODULES)
+    return {
+        "module": module,
+        "import_ms": round(min(timings) / 1000, 2),
+        "heavy_modules": sorted({name.split(".")[0] for name in heavy}),
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the CLI entry points")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module (best is kept)")
+    parser.add_argument("--max-import-ms", type=float, default=150,
+                        help="Fail if an entry module takes longer than this to import")
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args(argv)
+
+    entries = [measure(module, args.repeat) for module in ENTRY_MODULES]
+    runtime = [measure(module, args.repeat) for module in RUNTIME_MODULES]
+
+    failed = False
+    for result in entries + runtime:
+        line = f"{result['module']}: {result['import_ms']:.1f}ms"
+        if result in entries:
+            if result["heavy_modules"]:
+                line += f"  FAIL: imports {', '.join(result['heavy_modules'])}"
+                failed = True
+            elif result["import_ms"] > args.max_import_ms:
+                line += f"  FAIL: over {args.max_import_ms}ms budget"
+                failed = True
+        print(line)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "entry": entries, "runtime": runtime}, f, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,7 +39,7 @@ Return a JSON object:
 }}
 """
 
-def citation_agent_node(state: AgentState) -> dict:
+async def citation_agent_node(state: AgentState) -> dict:
     """
     Process the research findings and add proper citations.
     """
@@ -58,7 +58,7 @@ def citation_agent_node(state: AgentState) -> dict:
         sources_text = "No sources available."
     
     provider = state.get("provider", "openai")
-    model = get_llm(provider=provider, temperature=0.3)
+    model = get_llm(provider=provider, temperature=0.3, use_cache=state.get("use_llm_cache", True))
     
     prompt = ChatPromptTemplate.from_messages([
         ("system", CITATION_AGENT_PROMPT),
@@ -66,10 +66,10 @@ def citation_agent_node(state: AgentState) -> dict:
     ])
     
     chain = prompt | model
-    response = chain.invoke({
+    response = await chain.ainvoke({
         "synthesis": synthesis,
         "sources": sources_text,
-        "current_date": datetime.now().isoformat()
+        "current_date": datetime.now().date().isoformat()
     })
     
     try:
@@ -8,6 +8,7 @@ Responsibilities:
 4. Synthesize subagent results
 5. Decide if more research is needed
 """
+import os
 import json
 from datetime import datetime
 from typing import List
@@ -16,6 +17,8 @@ from langchain_core.messages import AIMessage, HumanMessage
 from src.state.schema import AgentState, ResearchPlan, SubagentTask
 from src.utils.llm_provider import get_llm
 from src.utils.memory import MemoryStore
+from src.utils.sources import SourceRegistry
+from src.utils.instrumentation import tracing_enabled, write_timeline
 
 LEAD_RESEARCHER_SYSTEM_PROMPT = """You are a Lead Research Agent coordinating a multi-agent research system.
 
@@ -55,7 +58,8 @@ Return a JSON object with this structure:
             "search_strategy": "broad" | "specific",
             "output_format": "<expected format>",
             "tool_guidance": "<tool recommendations>",
-            "boundaries": "<scope limits>"
+            "boundaries": "<scope limits>",
+            "priority": <0-10, higher for tasks the rest of the research depends on>
         }}
     ]
 }}
@@ -92,7 +96,7 @@ Return a JSON object:
 }}
 """
 
-def lead_researcher_planning_node(state: AgentState) -> dict:
+async def lead_researcher_planning_node(state: AgentState) -> dict:
     """
     Initial planning phase - analyze query and create research plan.
     """
@@ -113,7 +117,7 @@ def lead_researcher_planning_node(state: AgentState) -> dict:
     
     # Get LLM
     provider = state.get("provider", "openai")
-    model = get_llm(provider=provider, temperature=0.3)
+    model = get_llm(provider=provider, temperature=0.3, use_cache=state.get("use_llm_cache", True))
     
     prompt = ChatPromptTemplate.from_messages([
         ("system", LEAD_RESEARCHER_SYSTEM_PROMPT),
@@ -121,10 +125,10 @@ def lead_researcher_planning_node(state: AgentState) -> dict:
     ])
     
     chain = prompt | model
-    response = chain.invoke({
+    response = await chain.ainvoke({
         "memory_context": memory_context,
         "query": user_query,
-        "current_date": datetime.now().isoformat()
+        "current_date": datetime.now().date().isoformat()
     })
     
     # Parse response
@@ -159,48 +163,42 @@ def lead_researcher_planning_node(state: AgentState) -> dict:
         return {"messages": [AIMessage(content=f"Error creating research plan: {e}")]}
 
 
-def lead_researcher_synthesis_node(state: AgentState) -> dict:
+async def lead_researcher_synthesis_node(state: AgentState) -> dict:
     """
     Synthesis phase - combine subagent results and decide next steps.
     """
     subagent_results = state.get("subagent_results", [])
-    research_plan = state.get("research_plan")
     iteration = state.get("iteration_count", 1)
     max_iterations = state.get("max_iterations", 3)
     output_dir = state.get("output_dir", "./research_output")
     conversation_id = state.get("conversation_id", "default")
-    all_sources = state.get("all_sources", [])
+    sources = SourceRegistry(state.get("all_sources", []))
+    # Set when the executor streamed results: the journal iteration is already open
+    partial = state.get("partial_synthesis")
     
-    # Format results for prompt
-    results_text = ""
+    if tracing_enabled() and subagent_results:
+        write_timeline(
+            [r.profile for r in subagent_results if r.profile],
+            os.path.join(output_dir, f"subagent_timeline_{conversation_id}_{iteration}.json")
+        )
+    
+    # Collect sources, merging duplicates by normalized URL
     for result in subagent_results:
-        results_text += f"\n### {result.task_id}\n"
-        results_text += f"**Confidence**: {result.confidence:.0%}\n"
-        results_text += f"**Findings**: {result.findings}\n"
-        results_text += f"**Gaps**: {', '.join(result.gaps) if result.gaps else 'None'}\n"
-        
-        # Collect sources
         for src in result.sources:
-            if src not in all_sources:
-                all_sources.append(src)
+            sources.add(src)
     
-    # Get LLM
-    provider = state.get("provider", "openai")
-    model = get_llm(provider=provider, temperature=0.3)
+    all_sources = sources.to_list()
     
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", SYNTHESIS_PROMPT),
-        ("human", "Synthesize the research findings and decide next steps.")
-    ])
+    # Format results for prompt, reusing the partial synthesis of early results if there is one
+    if partial and partial.get("synthesis"):
+        covered = set(partial["task_ids"])
+        results_text = f"\n### Synthesis of earlier results ({', '.join(partial['task_ids'])})\n{partial['synthesis']}\n"
+        results_text += _format_results([r for r in subagent_results if r.task_id not in covered])
+    else:
+        results_text = _format_results(subagent_results)
     
-    chain = prompt | model
-    response = chain.invoke({
-        "subagent_results": results_text,
-        "research_plan": research_plan.strategy if research_plan else "No plan",
-        "iteration": iteration,
-        "max_iterations": max_iterations,
-        "current_date": datetime.now().isoformat()
-    })
+    chain = _synthesis_chain(state)
+    response = await chain.ainvoke(_synthesis_inputs(state, results_text))
     
     # Parse response
     try:
@@ -212,7 +210,10 @@ def lead_researcher_synthesis_node(state: AgentState) -> dict:
         
         # Save progress to memory
         memory = MemoryStore(output_dir, conversation_id)
-        memory.update_progress(iteration, subagent_results, synthesis)
+        if partial is not None:
+            memory.finish_iteration(iteration, state.get("journal_offset"), synthesis)
+        else:
+            memory.update_progress(iteration, subagent_results, synthesis)
         
         if needs_more:
             # Create new subagent tasks with validation
@@ -228,7 +229,9 @@ def lead_researcher_synthesis_node(state: AgentState) -> dict:
             if new_tasks:
                 return {
                     "subagent_tasks": new_tasks,
-                    "subagent_results": [],
+                    "subagent_results": None,
+                    "partial_synthesis": None,
+                    "journal_offset": None,
                     "iteration_count": iteration + 1,
                     "research_complete": False,
                     "all_sources": all_sources,
@@ -244,20 +247,76 @@ def lead_researcher_synthesis_node(state: AgentState) -> dict:
             "research_complete": True,
             "all_sources": all_sources,
             "memory_context": synthesis,
+            "partial_synthesis": None,
+            "journal_offset": None,
             "messages": [AIMessage(content=f"Research complete after {iteration} iterations. Proceeding to citation.")]
         }
             
     except Exception as e:
         # Fallback: create synthesis from results
         synthesis = _create_synthesis_from_results(subagent_results)
+        if partial is not None:
+            MemoryStore(output_dir, conversation_id).finish_iteration(iteration, state.get("journal_offset"), synthesis)
         return {
             "research_complete": True,
             "all_sources": all_sources,
             "memory_context": synthesis,
+            "partial_synthesis": None,
+            "journal_offset": None,
             "messages": [AIMessage(content=f"Synthesis completed. Proceeding to citation.")]
         }
 
 
+async def partial_synthesis(subagent_results: List, state: AgentState) -> str:
+    """
+    Synthesize the results that have arrived so far.
+    
+    Runs while the remaining subagents are still working; its summary stands
+    in for these results in the final synthesis prompt.
+    """
+    response = await _synthesis_chain(state).ainvoke(
+        _synthesis_inputs(state, _format_results(subagent_results))
+    )
+    try:
+        content = response.content.replace("```json", "").replace("```", "").strip()
+        return json.loads(content).get("synthesis", "")
+    except Exception:
+        return ""
+
+
+def _synthesis_chain(state: AgentState):
+    provider = state.get("provider", "openai")
+    model = get_llm(provider=provider, temperature=0.3, use_cache=state.get("use_llm_cache", True))
+    
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", SYNTHESIS_PROMPT),
+        ("human", "Synthesize the research findings and decide next steps.")
+    ])
+    return prompt | model
+
+
+def _synthesis_inputs(state: AgentState, results_text: str) -> dict:
+    research_plan = state.get("research_plan")
+    return {
+        "subagent_results": results_text,
+        "research_plan": research_plan.strategy if research_plan else "No plan",
+        "iteration": state.get("iteration_count", 1),
+        "max_iterations": state.get("max_iterations", 3),
+        "current_date": datetime.now().date().isoformat()
+    }
+
+
+def _format_results(subagent_results: List) -> str:
+    """Format subagent results for the synthesis prompt."""
+    results_text = ""
+    for result in subagent_results:
+        results_text += f"\n### {result.task_id}\n"
+        results_text += f"**Confidence**: {result.confidence:.0%}\n"
+        results_text += f"**Findings**: {result.findings}\n"
+        results_text += f"**Gaps**: {', '.join(result.gaps) if result.gaps else 'None'}\n"
+    return results_text
+
+
 def _create_synthesis_from_results(subagent_results: List) -> str:
     """Create a synthesis from subagent results."""
     if not subagent_results:
@@ -5,16 +5,31 @@ Features:
 - Receives detailed task from LeadResearcher
 - Uses LangGraph's prebuilt ReAct agent for tool execution
 - Returns structured findings with sources
+- Scheduled with bounded concurrency, priorities and retries
+- Optionally streams results out as each subagent completes
+- Compacts older search results in its prompts to stay under a token ceiling
 """
-import asyncio
+import os
 import json
+import random
+import math
+import time
+import asyncio
+from contextlib import aclosing
 from datetime import datetime
-from typing import List
-from langchain_core.messages import HumanMessage
-from langgraph.prebuilt import create_react_agent
-from src.state.schema import AgentState, SubagentTask, SubagentResult
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.errors import GraphRecursionError
+from langgraph.types import StreamWriter
+from src.state.schema import AgentState, SubagentTask, SubagentResult, SubagentBudget, SubagentTaskState
 from src.utils.llm_provider import get_llm
-from src.tools.search import search_web, search_web_with_sources, deep_search_web
+from src.tools.search import search_web, search_web_with_sources, deep_search_web, collect_sources, rephrased_search_scope
+from src.utils.memory import MemoryStore
+from src.utils.sources import SourceRegistry
+from src.utils.instrumentation import SubagentProfiler, start_span, finish_span, record_event
+from src.utils.compaction import compact_messages, compaction_hook, estimate_tokens
 
 SUBAGENT_SYSTEM_PROMPT = """You are a specialized Research Subagent with a specific task.
 
@@ -61,6 +76,7 @@ Generate and explore "what if" questions such as:
 - "What if the timeline was different?"
 
 ### 5. Iterative Deepening
+- You have a hard budget of {max_tool_calls} tool calls; plan your searches to fit it
 - Start with 3-5 broad searches
 - Identify 2-3 key leads to chase
 - Perform targeted follow-up searches (3-5 more)
@@ -95,11 +111,120 @@ After completing your research, provide findings in this JSON format:
 """
 
 
-async def execute_subagent_task(task: SubagentTask, provider: str = "openai") -> SubagentResult:
+# Hard limits per subagent, scaled with the plan's query_complexity
+COMPLEXITY_BUDGETS = {
+    "simple": SubagentBudget(max_tool_calls=10, max_tokens=60000, max_seconds=120, max_context_tokens=16000),
+    "moderate": SubagentBudget(max_tool_calls=15, max_tokens=120000, max_seconds=240, max_context_tokens=24000),
+    "complex": SubagentBudget(max_tool_calls=25, max_tokens=200000, max_seconds=420, max_context_tokens=32000),
+}
+
+FINAL_ANSWER_PROMPT = """Here is everything gathered for this task so far:
+
+{transcript}
+
+Your research budget is exhausted ({reason}). Do not call any tools.
+Using only the findings above, respond now with the final JSON in the required output format."""
+
+# What create_react_agent answers instead of calling tools once it runs out of graph steps
+STEP_LIMIT_REPLY = "Sorry, need more steps to process this request."
+
+
+def budget_for_complexity(query_complexity: Optional[str]) -> SubagentBudget:
+    """Pick the per-subagent budget for a plan's query_complexity."""
+    return COMPLEXITY_BUDGETS.get((query_complexity or "").lower(), COMPLEXITY_BUDGETS["moderate"])
+
+
+class BudgetController(BaseCallbackHandler):
+    """
+    Tracks a subagent's tool calls, tokens and wall-clock against its budget.
+    
+    execute_subagent_task checks it between ReAct steps and stops the agent
+    (before running a batch of tool calls that would overshoot) once a limit
+    is reached.
+    """
+    
+    def __init__(self, budget: SubagentBudget):
+        self.budget = budget
+        self.start = time.monotonic()
+        self.tool_calls = 0
+        self.tokens = 0
+        self.compacted_tokens = 0
+        self.exhausted_reason: Optional[str] = None
+    
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any) -> None:
+        self.tool_calls += 1
+    
+    def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                self.tokens += usage.get("total_tokens", 0)
+    
+    def should_stop(self, last_message: Any) -> bool:
+        """Decide, after a ReAct step, whether the agent must stop and answer."""
+        if self.exhausted_reason is None:
+            pending = len(getattr(last_message, "tool_calls", None) or [])
+            if pending and self.tool_calls + pending > self.budget.max_tool_calls:
+                self.exhausted_reason = f"tool call limit of {self.budget.max_tool_calls}"
+            elif self.tokens >= self.budget.max_tokens:
+                self.exhausted_reason = f"token limit of {self.budget.max_tokens}"
+            elif time.monotonic() - self.start >= self.budget.max_seconds:
+                self.exhausted_reason = f"time limit of {self.budget.max_seconds:g}s"
+        return self.exhausted_reason is not None
+    
+    def on_compact(self, saved_tokens: int) -> None:
+        self.compacted_tokens += saved_tokens
+        record_event("context_compacted")
+    
+    def summary(self) -> dict:
+        return {
+            "max_tool_calls": self.budget.max_tool_calls,
+            "max_tokens": self.budget.max_tokens,
+            "max_seconds": self.budget.max_seconds,
+            "max_context_tokens": self.budget.max_context_tokens,
+            "tool_calls": self.tool_calls,
+            "tokens": self.tokens,
+            "seconds": round(time.monotonic() - self.start, 3),
+            "compacted_tokens": self.compacted_tokens,
+            "exhausted": self.exhausted_reason,
+        }
+
+
+class SubagentProgress:
+    """
+    What a running subagent has gathered so far.
+    
+    Filled in by execute_subagent_task as the agent runs, so a subagent that
+    is cancelled at its deadline can still return a partial result.
+    """
+    
+    def __init__(self):
+        self.messages: List[BaseMessage] = []
+        self.sources: List[dict] = []
+        self.profiler: Optional[SubagentProfiler] = None
+
+
+async def execute_subagent_task(
+    task: SubagentTask,
+    provider: str = "openai",
+    budget: Optional[SubagentBudget] = None,
+    progress: Optional[SubagentProgress] = None,
+    use_cache: bool = True
+) -> SubagentResult:
     """
     Execute a single subagent task using ReAct agent pattern.
+    
+    The agent runs until it answers or its budget (tool calls, tokens,
+    wall-clock) is exhausted; in the latter case it is stopped and asked for
+    its final JSON based on what it has gathered. Before each turn, older
+    search results in the prompt are compacted so it stays under the budget's
+    max_context_tokens (the agent's own history keeps them in full). With
+    use_cache, ReAct turns may be served from the semantic LLM cache (if
+    LLM_SEMANTIC_CACHE=1).
     """
-    model = get_llm(provider=provider, temperature=0.5)
+    budget = budget or budget_for_complexity(None)
+    progress = progress or SubagentProgress()
+    model = get_llm(provider=provider, temperature=0.5, use_cache=use_cache, semantic_cache=True)
     
     # Format the system prompt with task details
     system_prompt = SUBAGENT_SYSTEM_PROMPT.format(
@@ -108,27 +233,160 @@ async def execute_subagent_task(task: SubagentTask, provider: str = "openai") ->
         output_format=task.output_format,
         tool_guidance=task.tool_guidance,
         boundaries=task.boundaries,
+        max_tool_calls=budget.max_tool_calls,
         current_date=datetime.now().isoformat()
     )
     
-    # Create ReAct agent with all search tools
+    from langgraph.prebuilt import create_react_agent
+    
+    # Create ReAct agent with all search tools, compacting its prompt before each turn
+    controller = BudgetController(budget)
     agent = create_react_agent(
         model=model,
         tools=[search_web, search_web_with_sources, deep_search_web],
-        prompt=system_prompt
+        prompt=system_prompt,
+        pre_model_hook=compaction_hook(
+            budget.max_context_tokens,
+            reserved_tokens=estimate_tokens([SystemMessage(content=system_prompt)]),
+            on_compact=controller.on_compact
+        ),
+        # The ReAct loop is not checkpointed; the research graph checkpoints the finished subagent
+        checkpointer=False
     )
     
-    # Run the agent
-    result = await asyncio.to_thread(
-        agent.invoke,
-        {"messages": [HumanMessage(content=f"Research task: {task.objective}")]}
+    # Run the agent natively on the event loop (async LLM client and async search tools),
+    # recording every LLM step and tool call for the task profile
+    profiler = SubagentProfiler(task.task_id)
+    progress.profiler = profiler
+    config = {
+        "callbacks": [profiler, controller],
+        # Backstop only: each tool round is three graph steps (compaction hook, model, tools)
+        "recursion_limit": 3 * budget.max_tool_calls + 10
+    }
+    span, span_tokens = start_span(task.task_id, kind="subagent")
+    try:
+        with collect_sources(progress.sources):
+            content = await _run_agent(agent, model, system_prompt, task, config, controller, progress)
+    except BaseException as e:
+        finish_span(span, span_tokens, e)
+        raise
+    finish_span(span, span_tokens)
+    profiler.end = span.end
+    
+    subagent_result = _parse_subagent_output(task, content)
+    subagent_result.profile = profiler.profile()
+    subagent_result.profile["budget"] = controller.summary()
+    return subagent_result
+
+
+async def _run_agent(
+    agent,
+    model,
+    system_prompt: str,
+    task: SubagentTask,
+    config: dict,
+    controller: BudgetController,
+    progress: SubagentProgress
+) -> str:
+    """Stream the ReAct agent until it answers or is stopped, and return its final text."""
+    messages = []
+    try:
+        stream = agent.astream(
+            {"messages": [HumanMessage(content=f"Research task: {task.objective}")]},
+            config=config,
+            stream_mode="values"
+        )
+        async with aclosing(stream):
+            async for state in stream:
+                messages = progress.messages = state["messages"]
+                if controller.should_stop(messages[-1]):
+                    break
+    except GraphRecursionError:
+        controller.exhausted_reason = controller.exhausted_reason or "step limit"
+    
+    # Extract final response, forcing one if the agent was stopped mid-research
+    final_message = messages[-1] if messages else None
+    if isinstance(final_message, AIMessage) and final_message.content == STEP_LIMIT_REPLY:
+        controller.exhausted_reason = controller.exhausted_reason or "step limit"
+    elif isinstance(final_message, AIMessage) and not final_message.tool_calls:
+        return final_message.content
+    return await _force_final_answer(
+        model, system_prompt, compact_messages(messages, controller.budget.max_context_tokens),
+        controller.exhausted_reason or "step limit", config["callbacks"]
     )
+
+
+def _partial_result(task: SubagentTask, progress: SubagentProgress, reason: str) -> SubagentResult:
+    """Build a result from whatever a subagent gathered before it was stopped."""
+    notes = [
+        message.content for message in progress.messages
+        if isinstance(message, AIMessage) and isinstance(message.content, str) and message.content.strip()
+    ]
+    registry = SourceRegistry([
+        {
+            "url": source.get("url", ""),
+            "title": source.get("title", "Unknown"),
+            "snippet": (source.get("content") or "")[:300],
+            "score": source.get("score", 0.0)
+        }
+        for source in progress.sources if source.get("url")
+    ])
+    sources = sorted(registry.to_list(), key=lambda source: source.get("score") or 0.0, reverse=True)[:10]
     
-    # Extract final response
-    final_message = result["messages"][-1]
-    content = final_message.content if hasattr(final_message, 'content') else str(final_message)
+    profile = None
+    if progress.profiler is not None:
+        progress.profiler.end = progress.profiler.end or time.time()
+        profile = progress.profiler.profile()
     
-    # Parse the response
+    return SubagentResult(
+        task_id=task.task_id,
+        findings="\n\n".join(notes) or f"Partial results only ({reason}); see the sources gathered so far.",
+        sources=sources,
+        confidence=0.3 if sources else 0.0,
+        gaps=[f"Subagent stopped early: {reason}"],
+        profile=profile
+    )
+
+
+def _render_transcript(messages: List[BaseMessage], max_chars: int = 3000) -> str:
+    """Flatten a ReAct message history into plain text (no tool-call structure)."""
+    parts = []
+    for message in messages:
+        if isinstance(message, ToolMessage):
+            content = str(message.content)
+            if len(content) > max_chars:
+                content = content[:max_chars] + "..."
+            parts.append(f"[{message.name or 'tool'} result]\n{content}")
+        elif isinstance(message, AIMessage):
+            if message.content:
+                parts.append(f"[Your notes]\n{message.content}")
+            for call in message.tool_calls:
+                parts.append(f"[Called {call['name']}] {json.dumps(call['args'])}")
+    return "\n\n".join(parts) or "Nothing was gathered."
+
+
+async def _force_final_answer(
+    model,
+    system_prompt: str,
+    messages: List[BaseMessage],
+    reason: str,
+    callbacks: list
+) -> str:
+    """Ask the model, without tools, for its final JSON from the research so far."""
+    response = await model.ainvoke(
+        [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=FINAL_ANSWER_PROMPT.format(
+                transcript=_render_transcript(messages), reason=reason
+            ))
+        ],
+        config={"callbacks": callbacks}
+    )
+    return response.content
+
+
+def _parse_subagent_output(task: SubagentTask, content: str) -> SubagentResult:
+    """Turn the agent's final message into a SubagentResult."""
     try:
         # Try to extract JSON from response
         json_content = content.replace("```json", "").replace("```", "").strip()
@@ -160,46 +418,298 @@ async def execute_subagent_task(task: SubagentTask, provider: str = "openai") ->
         )
 
 
-async def run_subagents_parallel(tasks: List[SubagentTask], provider: str = "openai") -> List[SubagentResult]:
+class SubagentScheduler:
     """
-    Run multiple subagent tasks in parallel using asyncio.gather.
+    Runs subagent tasks with bounded concurrency, priority ordering and retries.
+    
+    - At most max_concurrency subagents run at once; the rest wait in a priority queue
+    - Higher-priority tasks start first, ties keep the plan order
+    - A failed subagent is retried with exponential backoff and full jitter
+    - A subagent still running at its task deadline, or at the iteration
+      deadline, is cancelled and returns a partial result built from the
+      findings and sources it had gathered
+    
+    Per-call rate limits for the LLM and Tavily are enforced separately by the
+    shared token buckets in src.utils.rate_limit.
     """
-    coroutines = [execute_subagent_task(task, provider) for task in tasks]
-    results = await asyncio.gather(*coroutines, return_exceptions=True)
     
-    # Filter out exceptions and convert to SubagentResult
-    valid_results = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            valid_results.append(SubagentResult(
-                task_id=tasks[i].task_id,
-                findings=f"Error: {result}",
-                sources=[],
-                confidence=0.0,
-                gaps=["Subagent execution failed"]
-            ))
-        else:
-            valid_results.append(result)
+    def __init__(
+        self,
+        max_concurrency: int = 5,
+        max_retries: int = 2,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        task_timeout: Optional[float] = None,
+        iteration_timeout: Optional[float] = None,
+        use_llm_cache: bool = True
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.task_timeout = task_timeout
+        self.iteration_timeout = iteration_timeout
+        self.use_llm_cache = use_llm_cache
+    
+    async def run(
+        self,
+        tasks: List[SubagentTask],
+        provider: str = "openai",
+        budget: Optional[SubagentBudget] = None
+    ) -> List[SubagentResult]:
+        """Run all tasks and return their results in the original task order."""
+        results: List[Optional[SubagentResult]] = [None] * len(tasks)
+        async for index, result in self.stream(tasks, provider, budget):
+            results[index] = result
+        return results
     
-    return valid_results
+    async def stream(
+        self,
+        tasks: List[SubagentTask],
+        provider: str = "openai",
+        budget: Optional[SubagentBudget] = None
+    ) -> AsyncIterator[Tuple[int, SubagentResult]]:
+        """
+        Run all tasks, yielding (task index, result) pairs as they complete.
+        
+        Tasks cut off by the iteration deadline are yielded last, as partial
+        (or empty, if never started) results.
+        """
+        queue = asyncio.PriorityQueue()
+        for index, task in enumerate(tasks):
+            queue.put_nowait((-task.priority, index, task))
+        
+        loop = asyncio.get_running_loop()
+        slots = [loop.create_future() for _ in tasks]
+        progress: Dict[int, SubagentProgress] = {}
+        
+        async def worker():
+            while True:
+                try:
+                    _, index, task = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                progress[index] = SubagentProgress()
+                try:
+                    result = await self._run_with_retries(task, provider, budget, progress[index])
+                except Exception as e:
+                    slots[index].set_exception(e)
+                else:
+                    slots[index].set_result((index, result))
+        
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.max_concurrency, len(tasks)))]
+        try:
+            for next_done in asyncio.as_completed(slots, timeout=self.iteration_timeout):
+                yield await next_done
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for pending_worker in workers:
+                pending_worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        # Whatever the iteration deadline cut off
+        for index, task in enumerate(tasks):
+            if slots[index].done():
+                continue
+            if index in progress:
+                yield index, _partial_result(task, progress[index], "iteration deadline reached")
+            else:
+                yield index, SubagentResult(
+                    task_id=task.task_id,
+                    findings="Not started before the iteration deadline.",
+                    sources=[],
+                    confidence=0.0,
+                    gaps=["Subagent not run: iteration deadline reached"]
+                )
+    
+    async def _run_with_retries(
+        self,
+        task: SubagentTask,
+        provider: str,
+        budget: Optional[SubagentBudget] = None,
+        progress: Optional[SubagentProgress] = None
+    ) -> SubagentResult:
+        progress = progress or SubagentProgress()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.task_timeout if self.task_timeout else None
+        attempt = 0
+        while True:
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                return await asyncio.wait_for(
+                    execute_subagent_task(task, provider, budget, progress, self.use_llm_cache), remaining
+                )
+            except Exception as e:
+                if deadline is not None and loop.time() >= deadline:
+                    return _partial_result(task, progress, f"timed out after {self.task_timeout:g}s")
+                if attempt >= self.max_retries:
+                    return SubagentResult(
+                        task_id=task.task_id,
+                        findings=f"Error: {e}",
+                        sources=[],
+                        confidence=0.0,
+                        gaps=["Subagent execution failed"]
+                    )
+                delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+                await asyncio.sleep(random.uniform(0, delay))
+                attempt += 1
+
+
+def _build_scheduler(
+    max_concurrency: Optional[int],
+    budget: SubagentBudget,
+    use_llm_cache: bool = True
+) -> SubagentScheduler:
+    return SubagentScheduler(
+        max_concurrency=max_concurrency or int(os.getenv("SUBAGENT_MAX_CONCURRENCY", "5")),
+        max_retries=int(os.getenv("SUBAGENT_MAX_RETRIES", "2")),
+        task_timeout=float(os.getenv("SUBAGENT_TIMEOUT", "0")) or budget.max_seconds + 60,
+        iteration_timeout=float(os.getenv("ITERATION_TIMEOUT", "900")) or None,
+        use_llm_cache=use_llm_cache
+    )
 
 
-def subagent_executor_node(state: AgentState) -> dict:
+async def run_subagents_parallel(
+    tasks: List[SubagentTask],
+    provider: str = "openai",
+    max_concurrency: Optional[int] = None,
+    budget: Optional[SubagentBudget] = None,
+    use_llm_cache: bool = True
+) -> List[SubagentResult]:
     """
-    LangGraph node that executes all subagent tasks in parallel.
+    Run multiple subagent tasks in parallel through a SubagentScheduler.
+    
+    max_concurrency falls back to SUBAGENT_MAX_CONCURRENCY (default: 5) and
+    retries to SUBAGENT_MAX_RETRIES (default: 2). Every task gets the same
+    budget (default: the "moderate" budget).
+    
+    Deadlines:
+    - SUBAGENT_TIMEOUT: Seconds per task (default: the budget's wall-clock
+      limit plus a minute for the forced final answer)
+    - ITERATION_TIMEOUT: Seconds for the whole batch (default: 900)
+    """
+    budget = budget or budget_for_complexity(None)
+    return await _build_scheduler(max_concurrency, budget, use_llm_cache).run(tasks, provider, budget)
+
+
+async def stream_subagents(
+    state: AgentState,
+    tasks: List[SubagentTask],
+    budget: SubagentBudget,
+    writer: Callable[[Any], None]
+) -> Tuple[List[SubagentResult], dict, List[dict], int]:
     """
-    from langchain_core.messages import AIMessage
+    Run subagents and process each result as soon as it completes.
     
+    Every result is journaled, has its sources merged into the registry and
+    is emitted through writer straight away. Once PARTIAL_SYNTHESIS_QUORUM of
+    the tasks (default: 0.5) have finished, a partial synthesis of those
+    results starts while the stragglers are still running, so the synthesis
+    node only has to fold in the late results.
+    
+    Returns the results in task order, the partial synthesis
+    ({"task_ids", "synthesis"}), the merged sources and the journal offset
+    of the iteration, which the synthesis node needs to close it.
+    """
+    from src.agents.lead_researcher import partial_synthesis
+    
+    iteration = state.get("iteration_count", 1)
+    memory = MemoryStore(state.get("output_dir", "./research_output"), state.get("conversation_id", "default"))
+    journal_offset = memory.begin_iteration(iteration)
+    # A retried or resumed run reopens the iteration; results already journaled are not written again
+    journaled = memory.recorded_task_ids(journal_offset)
+    sources = SourceRegistry(state.get("all_sources", []))
+    quorum = max(1, math.ceil(len(tasks) * float(os.getenv("PARTIAL_SYNTHESIS_QUORUM", "0.5"))))
+    
+    results: List[Optional[SubagentResult]] = [None] * len(tasks)
+    completed: List[SubagentResult] = []
+    covered: List[str] = []
+    synthesis_task = None
+    
+    scheduler = _build_scheduler(state.get("max_concurrency"), budget, state.get("use_llm_cache", True))
+    async for index, result in scheduler.stream(tasks, state.get("provider", "openai"), budget):
+        results[index] = result
+        completed.append(result)
+        if result.task_id not in journaled:
+            memory.append_result(result)
+            journaled.add(result.task_id)
+        for src in result.sources:
+            sources.add(src)
+        writer({"subagent_result": result, "completed": len(completed), "total": len(tasks)})
+        
+        if synthesis_task is None and quorum <= len(completed) < len(tasks):
+            covered = [r.task_id for r in completed]
+            synthesis_task = asyncio.create_task(partial_synthesis(list(completed), state))
+    
+    partial = {"task_ids": [], "synthesis": ""}
+    if synthesis_task is not None:
+        try:
+            partial = {"task_ids": covered, "synthesis": await synthesis_task}
+        except Exception:
+            pass  # The synthesis node falls back to synthesizing everything
+    
+    return results, partial, sources.to_list(), journal_offset
+
+
+async def subagent_node(state: SubagentTaskState, config: RunnableConfig) -> dict:
+    """
+    LangGraph node that runs a single subagent task.
+    
+    The workflow fans out one of these per SubagentTask with Send, so the
+    graph runtime schedules, checkpoints and retries each subagent on its
+    own. The task deadline and iteration deadline are enforced as in
+    run_subagents_parallel; a task whose iteration deadline has already
+    passed is not started.
+    
+    The iteration deadline counts from the fan-out, or from the start of the
+    run when a checkpointed fan-out is resumed (run_started_at, see
+    src.utils.checkpoint.thread_config), so tasks left pending by an
+    interrupted run get the full ITERATION_TIMEOUT again.
+    """
+    task = state["task"]
+    budget = state["budget"]
+    scheduler = _build_scheduler(1, budget, state.get("use_llm_cache", True))
+    if state.get("iteration_timeout"):
+        run_started_at = (config.get("configurable") or {}).get("run_started_at") or 0.0
+        started = max(state["dispatched_at"], run_started_at)
+        scheduler.iteration_timeout = max(0.0, started + state["iteration_timeout"] - time.time())
+    
+    # Rephrased searches are served across all subagents of the session
+    with rephrased_search_scope(state.get("conversation_id", "")):
+        results = await scheduler.run([task], state.get("provider", "openai"), budget)
+    return {"subagent_results": results}
+
+
+async def subagent_executor_node(state: AgentState, writer: StreamWriter) -> dict:
+    """
+    LangGraph node that executes all subagent tasks in parallel.
+    
+    With stream_results set, results are processed and streamed (custom
+    stream mode) as they complete; see stream_subagents.
+    """
     tasks = state.get("subagent_tasks", [])
     provider = state.get("provider", "openai")
+    max_concurrency = state.get("max_concurrency")
+    research_plan = state.get("research_plan")
+    budget = budget_for_complexity(research_plan.query_complexity if research_plan else None)
     
     if not tasks:
         return {"messages": [AIMessage(content="No subagent tasks to execute.")]}
     
-    # Run subagents in parallel
-    results = asyncio.run(run_subagents_parallel(tasks, provider))
+    update = {}
+    with rephrased_search_scope(state.get("conversation_id", "")):
+        if state.get("stream_results"):
+            results, partial, all_sources, journal_offset = await stream_subagents(state, tasks, budget, writer)
+            update = {"partial_synthesis": partial, "all_sources": all_sources, "journal_offset": journal_offset}
+        else:
+            # Run subagents in parallel
+            results = await run_subagents_parallel(
+                tasks, provider, max_concurrency, budget, state.get("use_llm_cache", True)
+            )
     
     return {
+        **update,
         "subagent_results": results,
         "messages": [AIMessage(content=f"Executed {len(results)} subagent tasks in parallel.")]
     }
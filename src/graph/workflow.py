@@ -5,16 +5,25 @@ This workflow implements the orchestrator-worker pattern with:
 - LeadResearcher (planning and synthesis)
 - Parallel Subagents (research execution)
 - CitationAgent (final attribution)
+
+All nodes are async: run the graph with astream/ainvoke (or arun_research)
+from any event loop, including one shared by many concurrent sessions.
 """
+import os
+import time
+from typing import List, Union
 from langgraph.graph import StateGraph, START, END
+from langgraph.types import RetryPolicy, Send
 
 from src.state.schema import AgentState
 from src.agents.lead_researcher import (
     lead_researcher_planning_node,
     lead_researcher_synthesis_node
 )
-from src.agents.subagent import subagent_executor_node
+from src.agents.subagent import subagent_node, subagent_executor_node, budget_for_complexity
 from src.agents.citation_agent import citation_agent_node
+from src.utils.checkpoint import thread_config
+from src.utils.instrumentation import instrument_node
 
 
 def should_continue_research(state: AgentState) -> str:
@@ -31,51 +40,83 @@ def should_continue_research(state: AgentState) -> str:
         return "continue"
 
 
-def has_tasks(state: AgentState) -> str:
+def dispatch_subagents(state: AgentState) -> Union[str, List[Send]]:
     """
-    Routing function: check if there are subagent tasks to execute.
+    Routing function: fan out one subagent node per task.
+    
+    Tasks are sent in priority order and share one iteration deadline
+    (ITERATION_TIMEOUT, default: 900s). In streaming mode the whole batch
+    runs in subagent_executor instead, which overlaps synthesis with the
+    slowest subagents. Without tasks, go straight to synthesis.
     """
     tasks = state.get("subagent_tasks", [])
-    if tasks:
-        return "execute"
-    else:
-        return "synthesize"
+    if not tasks:
+        return "lead_synthesis"
+    if state.get("stream_results"):
+        return "subagent_executor"
+    
+    research_plan = state.get("research_plan")
+    budget = budget_for_complexity(research_plan.query_complexity if research_plan else None)
+    iteration_timeout = float(os.getenv("ITERATION_TIMEOUT", "900"))
+    dispatched_at = time.time()
+    
+    return [
+        Send("subagent", {
+            "task": task,
+            "budget": budget,
+            "dispatched_at": dispatched_at,
+            "iteration_timeout": iteration_timeout,
+            "provider": state.get("provider", "openai"),
+            "conversation_id": state.get("conversation_id", ""),
+            "use_llm_cache": state.get("use_llm_cache", True)
+        })
+        for task in sorted(tasks, key=lambda task: -task.priority)
+    ]
 
 
-def build_graph():
+def build_graph(checkpointer=None):
     """
     Build the multi-agent research workflow graph.
     
     Flow:
-    START -> lead_planning -> [has_tasks?]
+    START -> lead_planning -> [dispatch_subagents]
                                 |
-                    [execute] -> subagent_executor -> lead_synthesis -> [should_continue?]
-                                                                            |
+                    [Send per task] -> subagent (x N) -> lead_synthesis -> [should_continue?]
+                    [streaming] -> subagent_executor ---^                     |
                                                         [continue] -> lead_planning (loop)
                                                         [citation] -> citation_agent -> END
+    
+    Pass {"max_concurrency": N} in the run config to cap how many subagents
+    run at once. With a checkpointer (see src.utils.checkpoint) every
+    completed node and subagent is saved under the run's thread_id, so an
+    interrupted session can be resumed.
     """
     workflow = StateGraph(AgentState)
     
-    # Add nodes
-    workflow.add_node("lead_planning", lead_researcher_planning_node)
-    workflow.add_node("subagent_executor", subagent_executor_node)
-    workflow.add_node("lead_synthesis", lead_researcher_synthesis_node)
-    workflow.add_node("citation_agent", citation_agent_node)
+    # Add nodes, each wrapped in an instrumentation span
+    workflow.add_node("lead_planning", instrument_node("lead_planning", lead_researcher_planning_node))
+    workflow.add_node(
+        "subagent",
+        instrument_node("subagent", subagent_node),
+        # Subagent failures are retried inside the node; this covers anything that escapes it
+        retry_policy=RetryPolicy(max_attempts=int(os.getenv("SUBAGENT_MAX_RETRIES", "2")) + 1)
+    )
+    workflow.add_node("subagent_executor", instrument_node("subagent_executor", subagent_executor_node))
+    workflow.add_node("lead_synthesis", instrument_node("lead_synthesis", lead_researcher_synthesis_node))
+    workflow.add_node("citation_agent", instrument_node("citation_agent", citation_agent_node))
     
     # Entry point
     workflow.add_edge(START, "lead_planning")
     
-    # After planning, check if we have tasks
+    # After planning, fan out the tasks (or skip execution if there are none)
     workflow.add_conditional_edges(
         "lead_planning",
-        has_tasks,
-        {
-            "execute": "subagent_executor",
-            "synthesize": "lead_synthesis"  # Skip execution if no tasks
-        }
+        dispatch_subagents,
+        ["subagent", "subagent_executor", "lead_synthesis"]
     )
     
     # After subagent execution, go to synthesis
+    workflow.add_edge("subagent", "lead_synthesis")
     workflow.add_edge("subagent_executor", "lead_synthesis")
     
     # After synthesis, decide whether to continue or cite
@@ -91,7 +132,7 @@ def build_graph():
     # Citation agent ends the workflow
     workflow.add_edge("citation_agent", END)
     
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
 
 def get_initial_state(query: str, conversation_id: str, output_dir: str = "./research_output", provider: str = "openai") -> dict:
@@ -105,12 +146,33 @@ def get_initial_state(query: str, conversation_id: str, output_dir: str = "./res
         "research_plan": None,
         "subagent_tasks": [],
         "subagent_results": [],
+        "stream_results": False,
+        "partial_synthesis": None,
+        "journal_offset": None,
         "memory_context": "",
         "iteration_count": 0,
         "max_iterations": 3,
         "research_complete": False,
+        "max_concurrency": 5,
         "all_sources": [],
         "conversation_id": conversation_id,
         "output_dir": output_dir,
-        "provider": provider
+        "provider": provider,
+        "use_llm_cache": True
     }
+
+
+async def arun_research(graph, query: str, conversation_id: str, output_dir: str = "./research_output",
+                        provider: str = "openai", **settings) -> dict:
+    """
+    Run one research session to completion on the current event loop.
+    
+    Extra keyword arguments (max_iterations, max_concurrency, stream_results,
+    use_llm_cache) override the initial state. Sessions are independent, so
+    a service can await many of them concurrently against one compiled graph.
+    Returns the final graph state.
+    """
+    state = get_initial_state(query, conversation_id, output_dir=output_dir, provider=provider)
+    state.update(settings)
+    config = thread_config(conversation_id, max_concurrency=state["max_concurrency"])
+    return await graph.ainvoke(state, config=config)
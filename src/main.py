@@ -4,18 +4,36 @@ Deep Research Agent - Multi-Agent Research System
 Usage:
     python -m src.main "Your research query here"
     python -m src.main "Your query" --provider openai --output ./output
+    python -m src.main --resume <session-id>
 """
+import os
 import sys
 import uuid
 import argparse
-import dotenv
-from src.graph.workflow import build_graph, get_initial_state
 
-dotenv.load_dotenv(".env.example")
+# Only light standard-library modules are imported up front so that --help and
+# argument errors return immediately; the graph (langgraph, langchain, provider
+# SDKs) and asyncio are imported once a run starts. See benchmarks/startup.py.
+
+
+def load_environment() -> None:
+    """
+    Load API keys and settings from .env.
+    
+    .env.example is never read: its placeholder keys would otherwise become
+    real configuration whenever .env is missing a variable.
+    """
+    import dotenv
+    
+    dotenv.load_dotenv()
+
 
 def main():
+    load_environment()
     parser = argparse.ArgumentParser(description="Multi-Agent Deep Research System")
-    parser.add_argument("query", help="Research query")
+    parser.add_argument("query", nargs="?", help="Research query (omit with --resume)")
+    parser.add_argument("--resume", metavar="SESSION_ID",
+                        help="Continue an interrupted session from its last checkpoint (same --output)")
     parser.add_argument("--provider", default="openai", 
                         choices=["openai", "anthropic", "google"],
                         help="LLM provider to use")
@@ -23,32 +41,118 @@ def main():
                         help="Directory to save research outputs")
     parser.add_argument("--max-iterations", type=int, default=3,
                         help="Maximum research iterations")
+    parser.add_argument("--max-concurrency", type=int, default=5,
+                        help="Maximum subagents running at once")
+    parser.add_argument("--stream", action="store_true",
+                        help="Process subagent results as they complete (overlaps synthesis with stragglers)")
+    parser.add_argument("--no-llm-cache", action="store_true",
+                        help="Bypass the LLM response cache for this run")
+    parser.add_argument("--trace", default=os.getenv("RESEARCH_TRACE_FILE"),
+                        help="Append per-node timing/token spans to this JSONL file")
     
     args = parser.parse_args()
+    if not args.query and not args.resume:
+        parser.error("a research query is required unless --resume is given")
+    
+    import asyncio
+    
+    try:
+        asyncio.run(_amain(args, parser))
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+
+async def _amain(args, parser):
+    from src.graph.workflow import build_graph
+    from src.utils.checkpoint import checkpoint_path, open_checkpointer
+    
+    conversation_id = args.resume or str(uuid.uuid4())[:8]
+    
+    # Build graph, checkpointing every step under the session ID
+    async with open_checkpointer(checkpoint_path(args.output)) as checkpointer:
+        graph = build_graph(checkpointer=checkpointer)
+        await _research(args, parser, graph, checkpointer, conversation_id)
+
+
+async def _research(args, parser, graph, checkpointer, conversation_id: str) -> None:
+    """Start or resume the session and report progress until it completes."""
+    import asyncio
+    from src.graph.workflow import get_initial_state
+    from src.utils.checkpoint import checkpoint_path, thread_config
+    from src.utils.instrumentation import configure_tracing, format_metrics_summary
+    
+    config = thread_config(conversation_id, max_concurrency=args.max_concurrency)
+    
+    if args.resume:
+        if checkpointer is None:
+            parser.error("--resume needs checkpoints (RESEARCH_CHECKPOINT_DISABLED is set)")
+        snapshot = await graph.aget_state(config)
+        if not snapshot.values:
+            print(f"No checkpoint found for session {conversation_id} in {checkpoint_path(args.output)}")
+            sys.exit(1)
+        query = snapshot.values["messages"][0].content
+        provider = snapshot.values.get("provider", args.provider)
+    else:
+        query = args.query
+        provider = args.provider
     
-    conversation_id = str(uuid.uuid4())[:8]
     print(f"\n{'='*60}")
     print(f"Session ID: {conversation_id}")
-    print(f"Provider: {args.provider}")
+    print(f"Provider: {provider}")
     print(f"Output: {args.output}")
-    print(f"Query: {args.query}")
+    print(f"Query: {query}")
     print(f"{'='*60}\n")
     
-    # Build graph
-    graph = build_graph()
+    configure_tracing(args.trace)
     
-    # Create initial state
-    initial_state = get_initial_state(
-        query=args.query,
-        conversation_id=conversation_id,
-        output_dir=args.output,
-        provider=args.provider
-    )
-    initial_state["max_iterations"] = args.max_iterations
+    if args.resume:
+        if not snapshot.next:
+            print("Session already complete.")
+            print(f"Check: {args.output}/final_report_{conversation_id}.md")
+            return
+        # Settings (provider, iterations, caches) come from the saved session state
+        graph_input = None
+        print(f"Resuming research at: {', '.join(snapshot.next)}\n")
+    else:
+        # Create initial state
+        graph_input = get_initial_state(
+            query=args.query,
+            conversation_id=conversation_id,
+            output_dir=args.output,
+            provider=args.provider
+        )
+        graph_input["max_iterations"] = args.max_iterations
+        graph_input["max_concurrency"] = args.max_concurrency
+        graph_input["use_llm_cache"] = not args.no_llm_cache
+        graph_input["stream_results"] = args.stream
+        
+        print("Starting research...\n")
     
-    print("Starting research...\n")
+    try:
+        await _run(graph, graph_input, config)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        if checkpointer is not None:
+            print(f"\nInterrupted. Resume with: python -m src.main --resume {conversation_id} --output {args.output}")
+        raise
     
-    for event in graph.stream(initial_state):
+    print(f"\n{'='*60}")
+    print(f"Research complete!")
+    print(format_metrics_summary())
+    print(f"Check: {args.output}/final_report_{conversation_id}.md")
+    if args.trace:
+        print(f"Trace: {args.trace}")
+    print(f"{'='*60}\n")
+
+
+async def _run(graph, graph_input, config: dict) -> None:
+    """Stream the graph, printing progress as nodes complete."""
+    async for mode, event in graph.astream(graph_input, config=config, stream_mode=["updates", "custom"]):
+        if mode == "custom":
+            if "subagent_result" in event:
+                r = event["subagent_result"]
+                print(f"   ✓ {r.task_id} done ({event['completed']}/{event['total']}), {r.confidence:.0%} confidence")
+            continue
+        
         for node_name, state_update in event.items():
             print(f"\n--- {node_name.upper()} ---")
             
@@ -67,16 +171,15 @@ def main():
                 print(f"   Subagents: {plan.estimated_subagents}")
                 print(f"   Strategy: {plan.strategy[:100]}...")
             
-            if "subagent_results" in state_update:
+            if state_update.get("subagent_results"):
                 results = state_update["subagent_results"]
                 print(f"\n📊 Subagent Results: {len(results)} completed")
                 for r in results:
-                    print(f"   - {r.task_id}: {r.confidence:.0%} confidence")
-    
-    print(f"\n{'='*60}")
-    print(f"Research complete!")
-    print(f"Check: {args.output}/final_report_{conversation_id}.md")
-    print(f"{'='*60}\n")
+                    line = f"   - {r.task_id}: {r.confidence:.0%} confidence"
+                    if r.profile:
+                        tool_calls = sum(t["count"] for t in r.profile["tool_calls"].values())
+                        line += f", {tool_calls} tool calls in {r.profile['wall_s']:.1f}s"
+                    print(line)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,247 @@
+"""
+Research server: many research sessions in one long-lived process.
+
+Reads one JSON request per line on stdin and writes JSON events to stdout,
+one per line. All sessions run concurrently on one event loop over a single
+compiled graph, so the model clients, Tavily connection pools, search and
+LLM caches and the checkpoint database are opened once and stay warm.
+
+Usage:
+    python -m src.server --output ./research_output
+    echo '{"query": "Your research query"}' | python -m src.server
+
+Request fields:
+- query: Research query (required unless resuming)
+- id: Caller's request ID, echoed on every event for the request
+- session_id / resume: Session ID to use, or of an interrupted session to continue
+- provider, max_iterations, max_concurrency, stream, use_llm_cache: As the CLI options
+
+Events ({"event": ..., "id": ..., "session_id": ...}):
+- accepted / rejected (with "reason") when the request is read
+- started when the session gets a slot, node per completed graph node,
+  subagent per finished subagent (stream mode)
+- done (with "report" and "elapsed_s") or error (with "error")
+
+Each session writes to its own directory, <output>/<session_id>, so session
+IDs are limited to 1-64 letters, digits, "_" and "-".
+
+Configuration (environment variables):
+- RESEARCH_SERVER_MAX_SESSIONS: Sessions researched at once (default: 4)
+- RESEARCH_SERVER_MAX_PENDING: Running plus waiting sessions before new
+  requests are rejected (default: 32)
+"""
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+from typing import Callable, Dict, Optional
+from src.main import load_environment
+
+# Session IDs name the session's output directory and checkpoint thread
+SESSION_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+class ResearchServer:
+    """
+    Admits research requests and runs them as concurrent sessions.
+
+    At most max_sessions run at once; further requests wait for a slot, and
+    once max_pending sessions are running or waiting new ones are rejected
+    instead of queueing without bound.
+    """
+
+    def __init__(
+        self,
+        graph,
+        output_dir: str,
+        emit: Callable[[dict], None],
+        max_sessions: int = 4,
+        max_pending: int = 32
+    ):
+        self.graph = graph
+        self.output_dir = output_dir
+        self.emit = emit
+        self.max_pending = max_pending
+        self._slots = asyncio.Semaphore(max_sessions)
+        self._sessions: Dict[str, asyncio.Task] = {}
+
+    def submit(self, request: dict) -> Optional[asyncio.Task]:
+        """Admit a request and start its session, or emit why it was rejected."""
+        request_id = request.get("id")
+        session_id = request.get("resume") or request.get("session_id") or str(uuid.uuid4())[:8]
+
+        reason = None
+        if not request.get("query") and not request.get("resume"):
+            reason = "a query is required unless resume is given"
+        elif not isinstance(session_id, str) or not SESSION_ID.fullmatch(session_id):
+            reason = "session_id must be 1-64 letters, digits, '_' or '-'"
+            session_id = None
+        elif session_id in self._sessions:
+            reason = f"session {session_id} is already running"
+        elif len(self._sessions) >= self.max_pending:
+            reason = f"server busy ({len(self._sessions)} sessions pending)"
+        if reason:
+            self.emit({"event": "rejected", "id": request_id, "session_id": session_id, "reason": reason})
+            return None
+
+        self.emit({"event": "accepted", "id": request_id, "session_id": session_id})
+        task = asyncio.create_task(self._run_session(request, session_id))
+        self._sessions[session_id] = task
+        task.add_done_callback(lambda _: self._sessions.pop(session_id, None))
+        return task
+
+    async def drain(self) -> None:
+        """Wait for every admitted session to finish."""
+        while self._sessions:
+            await asyncio.gather(*self._sessions.values(), return_exceptions=True)
+
+    async def _run_session(self, request: dict, session_id: str) -> None:
+        from src.graph.workflow import get_initial_state
+        from src.utils.checkpoint import thread_config
+        
+        request_id = request.get("id")
+        event = {"id": request_id, "session_id": session_id}
+        output_dir = os.path.join(self.output_dir, session_id)
+        config = thread_config(session_id, max_concurrency=request.get("max_concurrency", 5))
+
+        async with self._slots:
+            start = time.perf_counter()
+            self.emit({**event, "event": "started"})
+            try:
+                if request.get("resume"):
+                    snapshot = await self.graph.aget_state(config)
+                    if not snapshot.values:
+                        raise ValueError(f"no checkpoint found for session {session_id}")
+                    graph_input = None
+                else:
+                    graph_input = get_initial_state(
+                        query=request["query"],
+                        conversation_id=session_id,
+                        output_dir=output_dir,
+                        provider=request.get("provider", "openai")
+                    )
+                    for field in ("max_iterations", "max_concurrency", "use_llm_cache"):
+                        if field in request:
+                            graph_input[field] = request[field]
+                    graph_input["stream_results"] = bool(request.get("stream", False))
+
+                async for mode, update in self.graph.astream(
+                    graph_input, config=config, stream_mode=["updates", "custom"]
+                ):
+                    if mode == "custom":
+                        if "subagent_result" in update:
+                            self.emit({
+                                **event,
+                                "event": "subagent",
+                                "task_id": update["subagent_result"].task_id,
+                                "completed": update["completed"],
+                                "total": update["total"]
+                            })
+                        continue
+                    for node_name in update:
+                        self.emit({**event, "event": "node", "node": node_name})
+            except Exception as e:
+                self.emit({**event, "event": "error", "error": f"{type(e).__name__}: {e}"})
+                return
+
+            self.emit({
+                **event,
+                "event": "done",
+                "report": os.path.join(output_dir, f"final_report_{session_id}.md"),
+                "elapsed_s": round(time.perf_counter() - start, 3)
+            })
+
+
+def _emit(event: dict) -> None:
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+
+async def _warm_up() -> None:
+    """Open the shared caches and clients once, before the first request needs them."""
+    from src.tools.cache import get_search_cache
+    from src.tools.search import get_async_tavily_client
+    from src.utils.llm_cache import get_llm_cache
+
+    get_search_cache()
+    get_llm_cache()
+    try:
+        get_async_tavily_client()
+    except ValueError:
+        pass  # No API key yet; sessions report the error themselves
+
+
+async def _close_clients() -> None:
+    from src.tools.search import aclose_tavily_client, close_tavily_clients
+    from src.utils.llm_provider import aclose_llms
+
+    await aclose_tavily_client()
+    close_tavily_clients()
+    await aclose_llms()
+
+
+async def serve(output_dir: str, max_sessions: int, max_pending: int, emit: Callable[[dict], None] = _emit) -> None:
+    """Serve JSONL requests from stdin until it is closed, then finish running sessions."""
+    from src.graph.workflow import build_graph
+    from src.utils.checkpoint import checkpoint_path, open_checkpointer
+    
+    loop = asyncio.get_running_loop()
+    await _warm_up()
+
+    async with open_checkpointer(checkpoint_path(output_dir)) as checkpointer:
+        server = ResearchServer(
+            build_graph(checkpointer=checkpointer),
+            output_dir,
+            emit,
+            max_sessions=max_sessions,
+            max_pending=max_pending
+        )
+        try:
+            while True:
+                line = await loop.run_in_executor(None, sys.stdin.readline)
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    emit({"event": "rejected", "id": None, "session_id": None, "reason": f"invalid request: {e}"})
+                    continue
+                server.submit(request)
+
+            await server.drain()
+        finally:
+            await _close_clients()
+
+
+def main():
+    load_environment()
+    parser = argparse.ArgumentParser(description="Multi-session research server (JSONL on stdin/stdout)")
+    parser.add_argument("--output", default="./research_output",
+                        help="Directory for session outputs (one subdirectory per session)")
+    parser.add_argument("--max-sessions", type=int, default=int(os.getenv("RESEARCH_SERVER_MAX_SESSIONS", "4")),
+                        help="Sessions researched at once")
+    parser.add_argument("--max-pending", type=int, default=int(os.getenv("RESEARCH_SERVER_MAX_PENDING", "32")),
+                        help="Running plus waiting sessions before new requests are rejected")
+    parser.add_argument("--trace", default=os.getenv("RESEARCH_TRACE_FILE"),
+                        help="Append per-node timing/token spans to this JSONL file")
+
+    args = parser.parse_args()
+    from src.utils.instrumentation import configure_tracing
+    configure_tracing(args.trace)
+
+    try:
+        asyncio.run(serve(args.output, args.max_sessions, args.max_pending))
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
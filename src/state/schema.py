@@ -12,6 +12,7 @@ class SubagentTask(BaseModel):
     output_format: str = Field(description="Expected output format")
     tool_guidance: str = Field(description="Which tools to prioritize")
     boundaries: str = Field(description="What NOT to do / scope limits")
+    priority: int = Field(default=0, description="Scheduling priority; higher runs first")
 
 # Subagent Result
 class SubagentResult(BaseModel):
@@ -21,6 +22,15 @@ class SubagentResult(BaseModel):
     sources: List[dict] = Field(default_factory=list)  # [{url, title, snippet}]
     confidence: float = Field(ge=0, le=1, description="Confidence in findings")
     gaps: List[str] = Field(default_factory=list, description="Information gaps identified")
+    profile: Optional[dict] = Field(default=None, description="Per-task LLM step and tool call profile")
+
+# Subagent Budget
+class SubagentBudget(BaseModel):
+    """Hard limits on the work a single subagent may do."""
+    max_tool_calls: int = Field(ge=1, description="Maximum number of tool calls")
+    max_tokens: int = Field(ge=1, description="Maximum LLM tokens (input + output)")
+    max_seconds: float = Field(gt=0, description="Maximum wall-clock seconds")
+    max_context_tokens: int = Field(default=24000, ge=1, description="Token ceiling on the prompt of each ReAct turn")
 
 # Research Plan
 class ResearchPlan(BaseModel):
@@ -30,6 +40,20 @@ class ResearchPlan(BaseModel):
     strategy: str = Field(description="Overall research strategy")
     subagent_tasks: List[SubagentTask] = Field(default_factory=list)
 
+def merge_subagent_results(
+    existing: Optional[List[SubagentResult]],
+    new: Optional[List[SubagentResult]]
+) -> List[SubagentResult]:
+    """
+    Reducer for subagent_results.
+    
+    Each fanned-out subagent contributes its own result; writing None clears
+    the list between iterations.
+    """
+    if new is None:
+        return []
+    return (existing or []) + list(new)
+
 class AgentState(TypedDict):
     """State for the multi-agent research system."""
     # Core messaging
@@ -40,7 +64,10 @@ class AgentState(TypedDict):
     
     # Subagent management
     subagent_tasks: List[SubagentTask]
-    subagent_results: List[SubagentResult]
+    subagent_results: Annotated[List[SubagentResult], merge_subagent_results]
+    stream_results: bool  # Process subagent results as they complete
+    partial_synthesis: Optional[dict]  # {"task_ids", "synthesis"} of early results, set when streaming
+    journal_offset: Optional[int]  # Journal offset of the iteration opened when streaming
     
     # Memory & context
     memory_context: str  # Retrieved from memory file
@@ -49,6 +76,7 @@ class AgentState(TypedDict):
     iteration_count: int
     max_iterations: int
     research_complete: bool
+    max_concurrency: int  # Maximum subagents running at once
     
     # Sources for citation
     all_sources: List[dict]
@@ -57,4 +85,14 @@ class AgentState(TypedDict):
     conversation_id: str
     output_dir: str  # Where to save markdown files
     provider: str  # LLM provider: 'openai', 'anthropic', 'google'
+    use_llm_cache: bool  # Serve repeated planning/synthesis/citation prompts from cache
 
+class SubagentTaskState(TypedDict):
+    """Input of one fanned-out subagent node (sent with Send)."""
+    task: SubagentTask
+    budget: SubagentBudget
+    dispatched_at: float  # When the iteration was fanned out, as a time.time() timestamp
+    iteration_timeout: float  # Seconds the iteration may take from then (0: no limit)
+    provider: str
+    conversation_id: str
+    use_llm_cache: bool
@@ -0,0 +1,143 @@
+"""
+Persistent search result cache shared by the Tavily search tools.
+
+Responses are stored in a SQLite database keyed on a hash of the normalized
+query and the search parameters that change what Tavily returns. Entries
+expire after a TTL and the least recently used entries are evicted once the
+cache grows past its size limit.
+
+Configuration (environment variables):
+- SEARCH_CACHE_PATH: SQLite file location
+- SEARCH_CACHE_TTL: Entry lifetime in seconds (default: 86400)
+- SEARCH_CACHE_MAX_ENTRIES: Maximum number of cached responses (default: 5000)
+- SEARCH_CACHE_DISABLED: Set to "1" to bypass the cache entirely
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Optional
+from src.utils.instrumentation import record_event
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "deep-research-agent", "search_cache.sqlite"
+)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+def make_cache_key(
+    query: str,
+    max_results: Optional[int] = None,
+    search_depth: Optional[str] = None,
+    include_answer: bool = False
+) -> str:
+    """Build the content-addressed key for a search request."""
+    payload = json.dumps(
+        [normalize_query(query), max_results, search_depth, bool(include_answer)]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """SQLite-backed search response cache with TTL expiry and LRU eviction."""
+
+    def __init__(self, path: str, ttl: float = 86400, max_entries: int = 5000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached response for key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            response, created_at = row
+            if now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                return None
+
+            self._conn.execute(
+                "UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        record_event("search_cache_hit")
+        return json.loads(response)
+
+    def set(self, key: str, response: dict) -> None:
+        """Store a response and evict expired or least recently used entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, response, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response), now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM search_cache WHERE created_at < ?", (now - self.ttl,)
+            )
+            self._conn.execute(
+                """DELETE FROM search_cache WHERE key IN (
+                    SELECT key FROM search_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[SearchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Get the process-wide search cache, or None if caching is disabled."""
+    global _cache
+
+    if os.getenv("SEARCH_CACHE_DISABLED") == "1":
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache(
+                path=os.getenv("SEARCH_CACHE_PATH", DEFAULT_CACHE_PATH),
+                ttl=float(os.getenv("SEARCH_CACHE_TTL", "86400")),
+                max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+            )
+        return _cache
@@ -1,21 +1,408 @@
 import os
-from dotenv import load_dotenv
-from tavily import TavilyClient
-from langchain_core.tools import tool
-from typing import List, Dict
+import asyncio
+import threading
+import weakref
+import contextvars
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait
+from langchain_core.tools import StructuredTool
+from typing import TYPE_CHECKING, Hashable, Iterator, List, Dict, Optional, Tuple
+from src.tools.cache import get_search_cache, make_cache_key
+from src.tools.singleflight import SingleFlight
+from src.utils.embeddings import tokenize
+from src.utils.instrumentation import record_event
+from src.utils.rate_limit import get_rate_limiter
 
-# Load environment variables
-load_dotenv()
+if TYPE_CHECKING:
+    # The Tavily SDK (and requests) is imported on the first search, not at startup
+    from tavily import TavilyClient, AsyncTavilyClient
 
-def get_tavily_client():
-    """Get or create Tavily client instance."""
+_client: Optional["TavilyClient"] = None
+_async_clients = weakref.WeakKeyDictionary()
+_client_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+# Identical searches in flight at the same time share one Tavily call
+_inflight = SingleFlight("search")
+_source_collector: contextvars.ContextVar[Optional[List[Dict]]] = contextvars.ContextVar(
+    "search_source_collector", default=None
+)
+# Recent searches of the most recently active sessions, for rephrasing lookups
+_rephrase_indexes: "OrderedDict[str, RephraseIndex]" = OrderedDict()
+_rephrase_index: contextvars.ContextVar[Optional["RephraseIndex"]] = contextvars.ContextVar(
+    "search_rephrase_index", default=None
+)
+MAX_REPHRASE_INDEX_SESSIONS = 64
+
+def _get_api_key() -> str:
     api_key = os.getenv("TAVILY_API_KEY")
     if not api_key:
         raise ValueError("TAVILY_API_KEY not found in environment variables")
-    return TavilyClient(api_key=api_key)
+    return api_key
+
+def get_tavily_client() -> "TavilyClient":
+    """
+    Get the process-wide Tavily client.
+    
+    The client is created once and its HTTP session keeps connections alive,
+    so repeated searches reuse TCP/TLS connections. The connection pool size
+    is read from TAVILY_POOL_SIZE (default: 16).
+    """
+    global _client
+    
+    with _client_lock:
+        if _client is None:
+            from requests.adapters import HTTPAdapter
+            from tavily import TavilyClient
+            
+            client = TavilyClient(api_key=_get_api_key())
+            pool_size = int(os.getenv("TAVILY_POOL_SIZE", "16"))
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            client.session.mount("https://", adapter)
+            client.session.mount("http://", adapter)
+            _client = client
+        return _client
+
+def get_async_tavily_client() -> "AsyncTavilyClient":
+    """
+    Get the async Tavily client for the running event loop.
+    
+    httpx connections are bound to the loop that opened them, so one client
+    is kept per event loop and reused by every coroutine running on it.
+    """
+    loop = asyncio.get_running_loop()
+    
+    with _client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            from tavily import AsyncTavilyClient
+            
+            client = AsyncTavilyClient(api_key=_get_api_key())
+            _async_clients[loop] = client
+        return client
+
+async def aclose_tavily_client() -> None:
+    """Close the async Tavily client bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    
+    with _client_lock:
+        client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.close()
+
+def close_tavily_clients() -> None:
+    """Close the pooled sync client and forget all per-loop async clients."""
+    global _client
+    
+    with _client_lock:
+        if _client is not None:
+            _client.session.close()
+            _client = None
+        _async_clients.clear()
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the bounded thread pool used to fan out concurrent searches."""
+    global _executor
+    
+    with _client_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("SEARCH_MAX_WORKERS", "8")),
+                thread_name_prefix="tavily-search"
+            )
+        return _executor
+
+@contextmanager
+def collect_sources(sources: Optional[List[Dict]] = None) -> Iterator[List[Dict]]:
+    """
+    Record every search result returned within the block into a list.
+    
+    Lets a caller (e.g. a subagent that may be cancelled) recover the sources
+    it has already seen without parsing tool output.
+    """
+    sources = [] if sources is None else sources
+    token = _source_collector.set(sources)
+    try:
+        yield sources
+    finally:
+        _source_collector.reset(token)
+
+def _collect(response: dict) -> None:
+    sources = _source_collector.get()
+    if sources is not None:
+        sources.extend(response.get("results", []))
+
+class RephraseIndex:
+    """
+    Bounded map from (search parameters, content words) to a Tavily response.
+    
+    Content words come from src.utils.embeddings.tokenize (lowercased, no
+    stopwords, simple plurals folded), so searches that only reorder words or
+    change function words share a key. Least recently used entries go first.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[dict]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+    
+    def set(self, key: Hashable, response: dict) -> None:
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
 
-@tool
-def search_web(query: str, max_results: int = 15) -> str:
+@contextmanager
+def rephrased_search_scope(session_id: str) -> Iterator[Optional[RephraseIndex]]:
+    """
+    Serve rephrasings of the session's recent searches within the block.
+    
+    A search with the same parameters and the same set of content words as
+    an earlier one ("X pricing 2025" vs "pricing of X in 2025") reuses its
+    response instead of calling Tavily. Changing any content word, including
+    refinements that add one ("coral reefs" -> "coral reef fish"), reaches
+    Tavily. Set SEARCH_REPHRASE_CACHE_DISABLED=1 to turn this off.
+    """
+    index = None
+    if os.getenv("SEARCH_REPHRASE_CACHE_DISABLED") != "1":
+        with _client_lock:
+            index = _rephrase_indexes.pop(session_id, None)
+            if index is None:
+                index = RephraseIndex(int(os.getenv("SEARCH_REPHRASE_MAX_ENTRIES", "256")))
+            _rephrase_indexes[session_id] = index
+            while len(_rephrase_indexes) > MAX_REPHRASE_INDEX_SESSIONS:
+                _rephrase_indexes.popitem(last=False)
+    
+    token = _rephrase_index.set(index)
+    try:
+        yield index
+    finally:
+        _rephrase_index.reset(token)
+
+def _rephrased_search(query: str, params: tuple) -> Tuple[Optional[tuple], Optional[dict]]:
+    """
+    Look for a rephrasing of query among the session's earlier searches, if scoped.
+    
+    Returns the query's (params, content words) key, for _remember_search,
+    and the earlier response if there is one.
+    """
+    index = _rephrase_index.get()
+    words = frozenset(tokenize(query))
+    if index is None or not words:
+        return None, None
+    
+    key = (params, words)
+    response = index.get(key)
+    if response is not None:
+        record_event("search_rephrase_hit")
+    return key, response
+
+def _remember_search(rephrase_key: Optional[tuple], response: dict) -> None:
+    index = _rephrase_index.get()
+    if index is not None and rephrase_key is not None:
+        index.set(rephrase_key, response)
+
+def cached_search(
+    query: str,
+    max_results: Optional[int] = None,
+    search_depth: str = "advanced",
+    include_answer: bool = False,
+    timeout: float = 60
+) -> dict:
+    """
+    Run a Tavily search through the shared result cache.
+    
+    Identical requests (after query normalization) are served from the
+    cache instead of hitting the API again, and concurrent identical
+    requests share a single API call. Within a rephrased_search_scope,
+    rephrasings of an earlier search are served too.
+    """
+    cache = get_search_cache()
+    key = make_cache_key(query, max_results, search_depth, include_answer)
+    
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            _collect(cached)
+            return cached
+    
+    rephrase_key, rephrased = _rephrased_search(query, (max_results, search_depth, include_answer))
+    if rephrased is not None:
+        _collect(rephrased)
+        return rephrased
+    
+    def fetch() -> dict:
+        rate_limiter = get_rate_limiter("tavily")
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        
+        tavily_client = get_tavily_client()
+        response = tavily_client.search(
+            query=query,
+            max_results=max_results,
+            search_depth=search_depth,
+            include_raw_content=False,
+            include_answer=include_answer,
+            timeout=timeout
+        )
+        
+        if cache is not None:
+            cache.set(key, response)
+        return response
+    
+    response = _inflight.do(key, fetch)
+    _remember_search(rephrase_key, response)
+    _collect(response)
+    return response
+
+async def acached_search(
+    query: str,
+    max_results: Optional[int] = None,
+    search_depth: str = "advanced",
+    include_answer: bool = False,
+    timeout: float = 60
+) -> dict:
+    """
+    Async variant of cached_search using the event loop's Tavily client.
+    
+    The SQLite cache is read and written in a worker thread, so a busy or
+    locked database stalls only this search, not every session on the loop.
+    """
+    cache = get_search_cache()
+    key = make_cache_key(query, max_results, search_depth, include_answer)
+    
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            _collect(cached)
+            return cached
+    
+    rephrase_key, rephrased = _rephrased_search(query, (max_results, search_depth, include_answer))
+    if rephrased is not None:
+        _collect(rephrased)
+        return rephrased
+    
+    async def fetch() -> dict:
+        rate_limiter = get_rate_limiter("tavily")
+        if rate_limiter is not None:
+            await rate_limiter.aacquire()
+        
+        tavily_client = get_async_tavily_client()
+        response = await tavily_client.search(
+            query=query,
+            max_results=max_results,
+            search_depth=search_depth,
+            include_raw_content=False,
+            include_answer=include_answer,
+            timeout=timeout
+        )
+        
+        if cache is not None:
+            await asyncio.to_thread(cache.set, key, response)
+        return response
+    
+    response = await _inflight.ado(key, fetch)
+    _remember_search(rephrase_key, response)
+    _collect(response)
+    return response
+
+def _format_search_results(query: str, response: dict) -> str:
+    results_text = f"Search results for: {query}\n\n"
+    for i, result in enumerate(response.get("results", []), 1):
+        results_text += f"{i}. {result.get('title', 'Untitled')}\n"
+        results_text += f"   URL: {result.get('url', '')}\n"
+        results_text += f"   {result.get('content', '')}\n\n"
+    
+    return results_text if response.get("results") else "No results found."
+
+def _format_sources(response: dict) -> List[Dict]:
+    results = []
+    
+    if response.get("answer"):
+        results.append({
+            "title": "AI Summary",
+            "url": "",
+            "content": response["answer"],
+            "score": 1.0,
+            "type": "answer"
+        })
+    
+    for result in response.get("results", []):
+        results.append({
+            "title": result.get("title", "Unknown"),
+            "url": result.get("url", ""),
+            "content": result.get("content", ""),
+            "score": result.get("score", 0.0),
+            "type": "source"
+        })
+    
+    return results if results else [{"title": "No Results", "url": "", "content": "No results found.", "score": 0.0, "type": "error"}]
+
+def _format_deep_results(query: str, main_outcome, follow_ups: List[str], follow_outcomes: list) -> Dict:
+    """
+    Assemble the deep search response from per-query outcomes.
+    
+    Each outcome is either a Tavily response dict or the exception raised
+    while fetching it, so partial results survive individual failures.
+    """
+    results = {
+        "main_query": query,
+        "main_answer": "",
+        "main_results": [],
+        "follow_up_results": [],
+        "leads": []
+    }
+    
+    if isinstance(main_outcome, BaseException):
+        results["error"] = str(main_outcome) or type(main_outcome).__name__
+    else:
+        results["main_answer"] = main_outcome.get("answer", "")
+        results["main_results"] = main_outcome.get("results", [])
+    
+    # Extract potential leads from main results
+    leads = []
+    for result in results["main_results"][:3]:
+        content = result.get("content", "")
+        if "?" in content or "however" in content.lower() or "but" in content.lower():
+            leads.append(content[:200] + "...")
+    
+    results["leads"] = leads
+    
+    # Keep whatever follow-ups finished; record failures instead of dropping the lot
+    for follow_up, outcome in zip(follow_ups, follow_outcomes):
+        if isinstance(outcome, BaseException):
+            results["follow_up_results"].append({
+                "query": follow_up,
+                "results": [],
+                "error": str(outcome) or type(outcome).__name__
+            })
+        else:
+            results["follow_up_results"].append({
+                "query": follow_up,
+                "results": outcome.get("results", [])
+            })
+    
+    return results
+
+def _future_outcome(future):
+    """Return a finished search result, or the exception if it failed or timed out."""
+    if not future.done():
+        future.cancel()
+        return TimeoutError("Search timed out")
+    return future.exception() or future.result()
+
+def _search_web(query: str, max_results: int = 15) -> str:
     """
     Search the web for information about a topic using Tavily API.
     Returns search results as formatted text with sources.
@@ -25,25 +412,27 @@ def search_web(query: str, max_results: int = 15) -> str:
         max_results: Maximum number of results to return (default: 5)
     """
     try:
-        tavily_client = get_tavily_client()
-        response = tavily_client.search(
+        response = cached_search(
             query=query,
             max_results=max_results,
             search_depth="advanced"
         )
-        
-        results_text = f"Search results for: {query}\n\n"
-        for i, result in enumerate(response.get("results", []), 1):
-            results_text += f"{i}. {result.get('title', 'Untitled')}\n"
-            results_text += f"   URL: {result.get('url', '')}\n"
-            results_text += f"   {result.get('content', '')}\n\n"
-        
-        return results_text if response.get("results") else "No results found."
+        return _format_search_results(query, response)
     except Exception as e:
         return f"Search error: {str(e)}"
 
-@tool
-def search_web_with_sources(query: str, max_results: int = 15, search_depth: str = "advanced") -> List[Dict]:
+async def _asearch_web(query: str, max_results: int = 15) -> str:
+    try:
+        response = await acached_search(
+            query=query,
+            max_results=max_results,
+            search_depth="advanced"
+        )
+        return _format_search_results(query, response)
+    except Exception as e:
+        return f"Search error: {str(e)}"
+
+def _search_web_with_sources(query: str, max_results: int = 15, search_depth: str = "advanced") -> List[Dict]:
     """
     Search the web and return structured results with source information using Tavily.
     
@@ -56,41 +445,29 @@ def search_web_with_sources(query: str, max_results: int = 15, search_depth: str
         List of dicts with: title, url, content, score
     """
     try:
-        tavily_client = get_tavily_client()
-        response = tavily_client.search(
+        response = cached_search(
             query=query,
             max_results=max_results,
             search_depth=search_depth,
-            include_raw_content=False,
             include_answer=True
         )
-        
-        results = []
-        
-        if response.get("answer"):
-            results.append({
-                "title": "AI Summary",
-                "url": "",
-                "content": response["answer"],
-                "score": 1.0,
-                "type": "answer"
-            })
-        
-        for result in response.get("results", []):
-            results.append({
-                "title": result.get("title", "Unknown"),
-                "url": result.get("url", ""),
-                "content": result.get("content", ""),
-                "score": result.get("score", 0.0),
-                "type": "source"
-            })
-        
-        return results if results else [{"title": "No Results", "url": "", "content": "No results found.", "score": 0.0, "type": "error"}]
+        return _format_sources(response)
+    except Exception as e:
+        return [{"title": "Search Error", "url": "", "content": str(e), "score": 0.0, "type": "error"}]
+
+async def _asearch_web_with_sources(query: str, max_results: int = 15, search_depth: str = "advanced") -> List[Dict]:
+    try:
+        response = await acached_search(
+            query=query,
+            max_results=max_results,
+            search_depth=search_depth,
+            include_answer=True
+        )
+        return _format_sources(response)
     except Exception as e:
         return [{"title": "Search Error", "url": "", "content": str(e), "score": 0.0, "type": "error"}]
 
-@tool
-def deep_search_web(query: str, follow_up_queries: List[str] = None) -> Dict:
+def _deep_search_web(query: str, follow_up_queries: List[str] = None) -> Dict:
     """
     Perform deep web search with automatic follow-up queries and lead-chasing.
     This tool uses Tavily's advanced search and automatically explores related topics.
@@ -102,48 +479,69 @@ def deep_search_web(query: str, follow_up_queries: List[str] = None) -> Dict:
     Returns:
         Dict with: main_results, follow_up_results, leads, summary
     """
-    try:
-        tavily_client = get_tavily_client()
-        main_response = tavily_client.search(
-            query=query,
-            search_depth="advanced",
-            include_answer=True
+    timeout = float(os.getenv("DEEP_SEARCH_TIMEOUT", "30"))
+    follow_ups = (follow_up_queries or [])[:3]
+    
+    # Dispatch the main query and all follow-ups at once, each in a copy of the
+    # caller's context so collect_sources still sees the results
+    executor = _get_executor()
+    main_future = executor.submit(
+        contextvars.copy_context().run,
+        cached_search, query=query, search_depth="advanced", include_answer=True, timeout=timeout
+    )
+    follow_futures = [
+        executor.submit(
+            contextvars.copy_context().run,
+            cached_search, query=follow_up, search_depth="advanced", timeout=timeout
         )
-        
-        results = {
-            "main_query": query,
-            "main_answer": main_response.get("answer", ""),
-            "main_results": main_response.get("results", []),
-            "follow_up_results": [],
-            "leads": []
-        }
-        
-        # Extract potential leads from main results
-        leads = []
-        for result in main_response.get("results", [])[:3]:
-            content = result.get("content", "")
-            if "?" in content or "however" in content.lower() or "but" in content.lower():
-                leads.append(content[:200] + "...")
-        
-        results["leads"] = leads
-        
-        if follow_up_queries:
-            for follow_up in follow_up_queries[:3]:
-                follow_response = tavily_client.search(
-                    query=follow_up,
-                    search_depth="advanced"
-                )
-                results["follow_up_results"].append({
-                    "query": follow_up,
-                    "results": follow_response.get("results", [])
-                })
-        
-        return results
-    except Exception as e:
-        return {
-            "main_query": query,
-            "error": str(e),
-            "main_results": [],
-            "follow_up_results": [],
-            "leads": []
-        }
+        for follow_up in follow_ups
+    ]
+    wait([main_future] + follow_futures, timeout=timeout)
+    
+    return _format_deep_results(
+        query,
+        _future_outcome(main_future),
+        follow_ups,
+        [_future_outcome(future) for future in follow_futures]
+    )
+
+async def _adeep_search_web(query: str, follow_up_queries: List[str] = None) -> Dict:
+    timeout = float(os.getenv("DEEP_SEARCH_TIMEOUT", "30"))
+    follow_ups = (follow_up_queries or [])[:3]
+    
+    outcomes = await asyncio.gather(
+        asyncio.wait_for(
+            acached_search(query=query, search_depth="advanced", include_answer=True, timeout=timeout),
+            timeout
+        ),
+        *[
+            asyncio.wait_for(
+                acached_search(query=follow_up, search_depth="advanced", timeout=timeout),
+                timeout
+            )
+            for follow_up in follow_ups
+        ],
+        return_exceptions=True
+    )
+    
+    return _format_deep_results(query, outcomes[0], follow_ups, list(outcomes[1:]))
+
+# Each tool exposes a sync implementation and a native async one; LangChain
+# picks the coroutine when the agent is driven with ainvoke.
+search_web = StructuredTool.from_function(
+    func=_search_web,
+    coroutine=_asearch_web,
+    name="search_web"
+)
+
+search_web_with_sources = StructuredTool.from_function(
+    func=_search_web_with_sources,
+    coroutine=_asearch_web_with_sources,
+    name="search_web_with_sources"
+)
+
+deep_search_web = StructuredTool.from_function(
+    func=_deep_search_web,
+    coroutine=_adeep_search_web,
+    name="deep_search_web"
+)
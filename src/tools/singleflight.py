@@ -0,0 +1,87 @@
+"""
+In-flight request coalescing for the search tools.
+
+When several subagents issue the same search at the same moment (typical at
+the start of an iteration, when every subagent explores the topic broadly),
+only the first caller hits the API; the others wait for its response instead
+of paying for their own. This complements the persistent search cache, which
+only helps once the first response has been stored.
+
+Each coalesced call is counted as a "<name>_coalesced" event on the active
+span and in the metrics registry.
+"""
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict
+from src.utils.instrumentation import record_event
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time and share its outcome.
+
+    Sync callers (tool threads) are coalesced with each other, and async
+    callers with others on the same event loop. The shared call's exception is
+    raised in every waiting caller.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._tasks = weakref.WeakKeyDictionary()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Return fn(), or the result of an identical call already in flight."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            record_event(f"{self.name}_coalesced")
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn(), or the result of an identical call already in flight.
+
+        The call runs as its own task, so a caller that is cancelled (e.g. by
+        a subagent deadline) does not cancel it for the others.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            tasks = self._tasks.setdefault(loop, {})
+
+        task = tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            tasks[key] = task
+            task.add_done_callback(lambda done: self._finish(tasks, key, done))
+        else:
+            record_event(f"{self.name}_coalesced")
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _finish(tasks: Dict[str, asyncio.Task], key: str, task: asyncio.Task) -> None:
+        if tasks.get(key) is task:
+            del tasks[key]
+        # Mark the exception retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
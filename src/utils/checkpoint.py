@@ -0,0 +1,67 @@
+"""
+Durable graph checkpoints for resumable research sessions.
+
+Every completed node (and every finished subagent) is written to a SQLite
+database keyed by the session's conversation_id, so an interrupted run can
+continue from where it stopped instead of repeating paid LLM and search work.
+
+Configuration (environment variables):
+- RESEARCH_CHECKPOINT_PATH: SQLite file location (default: checkpoints.sqlite
+  in the output directory)
+- RESEARCH_CHECKPOINT_DISABLED: Set to "1" to run without checkpoints
+"""
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+# State models stored in checkpoints, allowed back in on deserialization
+STATE_TYPES = [
+    ("src.state.schema", "ResearchPlan"),
+    ("src.state.schema", "SubagentTask"),
+    ("src.state.schema", "SubagentResult"),
+    ("src.state.schema", "SubagentBudget"),
+]
+
+
+def checkpoint_path(output_dir: str) -> str:
+    """Where the checkpoints for sessions writing to output_dir are kept."""
+    return os.getenv("RESEARCH_CHECKPOINT_PATH") or os.path.join(output_dir, "checkpoints.sqlite")
+
+
+@asynccontextmanager
+async def open_checkpointer(path: str) -> AsyncIterator[Optional["AsyncSqliteSaver"]]:
+    """
+    Open the SQLite checkpointer at path for the duration of the block.
+    
+    Yields None if checkpoints are disabled. The saver is async-only (the
+    graph runs through astream/ainvoke) and is safe to share between
+    sessions running concurrently on the same event loop.
+    """
+    if os.getenv("RESEARCH_CHECKPOINT_DISABLED") == "1":
+        yield None
+        return
+    
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    import aiosqlite
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    
+    async with aiosqlite.connect(path) as conn:
+        yield AsyncSqliteSaver(conn, serde=JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES))
+
+
+def thread_config(conversation_id: str, **config) -> dict:
+    """
+    Run config addressing the checkpoints of one research session.
+    
+    run_started_at records when this run (a new session or a resume) began,
+    so timestamps saved in the checkpoints by an earlier run can be re-based.
+    """
+    return {**config, "configurable": {"thread_id": conversation_id, "run_started_at": time.time()}}
@@ -0,0 +1,171 @@
+"""
+Context compaction for ReAct subagent message histories.
+
+Every search result a subagent reads stays in its message list and would be
+resent on every later turn. compact_messages() rewrites the history the model
+sees (the agent state keeps the full messages) so that:
+- tool results older than the latest tool round are reduced to their
+  sources' titles, URLs and a short snippet each
+- the prompt stays under a token ceiling, shrinking the oldest results
+  further first and truncating the latest round only as a last resort
+
+Compacted ToolMessages keep their id, name and tool_call_id and stay right
+after the AIMessage that requested them, so the tool-call pairing providers
+require is preserved. Tokens are estimated at ~4 characters each.
+"""
+import re
+import json
+from typing import Callable, List, Optional, Sequence
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+
+CHARS_PER_TOKEN = 4
+SNIPPET_CHARS = 200
+
+# One result as rendered by search_web ("1. Title\n   URL: ...\n   content")
+_FORMATTED_RESULT = re.compile(r"^\d+\. (.*)\n   URL: (.*)\n   (.*)$", re.MULTILINE)
+
+
+def _text(content) -> str:
+    if isinstance(content, str):
+        return content
+    return json.dumps(content)
+
+
+def estimate_tokens(messages: Sequence[BaseMessage]) -> int:
+    """Rough token count of a message list, tool-call arguments included."""
+    chars = 0
+    for message in messages:
+        chars += len(_text(message.content))
+        for call in getattr(message, "tool_calls", None) or []:
+            chars += len(call["name"]) + len(json.dumps(call["args"]))
+    return chars // CHARS_PER_TOKEN
+
+
+def _extract_sources(content: str) -> List[dict]:
+    """Pull (title, url, snippet) entries out of a search tool's output."""
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return [
+            {"title": title.strip(), "url": url.strip(), "snippet": snippet.strip()}
+            for title, url, snippet in _FORMATTED_RESULT.findall(content)
+        ]
+
+    sources = []
+
+    def walk(node) -> None:
+        if isinstance(node, dict):
+            if "url" in node:
+                sources.append({
+                    "title": str(node.get("title", "")),
+                    "url": str(node.get("url", "")),
+                    "snippet": str(node.get("content") or node.get("snippet") or "")
+                })
+                return
+            for key, value in node.items():
+                if key in ("main_answer", "answer") and isinstance(value, str) and value:
+                    sources.append({"title": "AI Summary", "url": "", "snippet": value})
+                else:
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(data)
+    return sources
+
+
+def digest_tool_output(content, snippet_chars: int = SNIPPET_CHARS) -> str:
+    """
+    Compact a search tool's output to its sources' metadata and key snippets.
+
+    With snippet_chars=0 only titles and URLs are kept. Output that carries no
+    recognisable sources is cut to its beginning instead.
+    """
+    content = _text(content)
+    sources = _extract_sources(content)
+    if not sources:
+        limit = max(snippet_chars * 2, 200)
+        return content if len(content) <= limit else content[:limit] + "... [truncated]"
+
+    lines = [f"[Compacted: {len(sources)} results; titles, URLs and key snippets kept]"]
+    for source in sources:
+        line = f"- {source['title']}"
+        if source["url"]:
+            line += f" ({source['url']})"
+        snippet = " ".join(source["snippet"].split())
+        if snippet_chars and snippet:
+            if len(snippet) > snippet_chars:
+                snippet = snippet[:snippet_chars] + "..."
+            line += f": {snippet}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _replace(message: ToolMessage, content: str) -> ToolMessage:
+    return message.model_copy(update={"content": content})
+
+
+def compact_messages(messages: Sequence[BaseMessage], max_tokens: int) -> List[BaseMessage]:
+    """
+    Return the messages to send to the model, compacted to fit max_tokens.
+
+    The latest tool round (the last AIMessage with tool calls and the results
+    after it) is left intact when it fits; everything older is digested.
+    """
+    messages = list(messages)
+    last_round = next(
+        (i for i in range(len(messages) - 1, -1, -1)
+         if isinstance(messages[i], AIMessage) and messages[i].tool_calls),
+        len(messages)
+    )
+    older = [i for i, m in enumerate(messages) if isinstance(m, ToolMessage) and i < last_round]
+    recent = [i for i, m in enumerate(messages) if isinstance(m, ToolMessage) and i > last_round]
+
+    # Older results are always digested; the model has already read them in full
+    for i in older:
+        messages[i] = _replace(messages[i], digest_tool_output(messages[i].content))
+    if estimate_tokens(messages) <= max_tokens:
+        return messages
+
+    # Then keep only titles and URLs of older results
+    for i in older:
+        messages[i] = _replace(messages[i], digest_tool_output(messages[i].content, snippet_chars=0))
+    if estimate_tokens(messages) <= max_tokens or not recent:
+        return messages
+
+    # Last resort: share what is left of the ceiling between the latest results
+    others = estimate_tokens([m for i, m in enumerate(messages) if i not in recent])
+    per_message = max(0, (max_tokens - others) * CHARS_PER_TOKEN // len(recent))
+    for i in recent:
+        content = _text(messages[i].content)
+        if len(content) > per_message:
+            digest = digest_tool_output(content)
+            content = digest if len(digest) <= per_message else digest[:per_message] + "... [truncated]"
+            messages[i] = _replace(messages[i], content)
+    return messages
+
+
+def compaction_hook(
+    max_tokens: int,
+    reserved_tokens: int = 0,
+    on_compact: Optional[Callable[[int], None]] = None
+) -> Callable[[dict], dict]:
+    """
+    Build a ReAct pre_model_hook that compacts the history before each model call.
+
+    reserved_tokens covers what is added after the hook (the system prompt).
+    on_compact, if given, is called with the estimated tokens saved.
+    """
+    ceiling = max(1, max_tokens - reserved_tokens)
+
+    def hook(state: dict) -> dict:
+        messages = state["messages"]
+        compacted = compact_messages(messages, ceiling)
+        if on_compact is not None:
+            saved = estimate_tokens(messages) - estimate_tokens(compacted)
+            if saved > 0:
+                on_compact(saved)
+        return {"llm_input_messages": compacted}
+
+    return hook
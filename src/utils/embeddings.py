@@ -0,0 +1,98 @@
+"""
+Local text embeddings for near-duplicate detection.
+
+tokenize reduces a text to its content words (lowercased, stopwords
+dropped, simple plurals folded); on its own it is enough to recognise a
+rephrased search ("X pricing 2025" vs "pricing of X in 2025").
+
+Long texts (rendered prompts) are embedded with embed_document as sparse
+hashed feature vectors of words and word bigrams, L2-normalized. This needs
+no model download or extra dependency and runs in microseconds on CPU.
+lsh_keys is a MinHash banding of a vector's features for finding candidate
+neighbours in an on-disk index, which are then compared with cosine.
+"""
+import re
+import math
+import zlib
+from typing import Dict, List
+
+# Sparse vector: bucket -> weight, L2-normalized
+Vector = Dict[int, float]
+
+DIMENSIONS = 1 << 18
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or the to what when where which who why with "
+    "about vs versus".split()
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+
+
+def _stem(token: str) -> str:
+    """Fold simple plurals so "cost" and "costs" share a feature."""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss") and not token[0].isdigit():
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list:
+    """Lowercased, plural-folded content words of text, without stopwords."""
+    return [_stem(token) for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _bucket(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8")) % DIMENSIONS
+
+
+def embed_document(text: str) -> Vector:
+    """Embed a long text as a normalized sparse vector of hashed word and word-bigram features."""
+    vector: Vector = {}
+    tokens = tokenize(text)
+    features = ["w:" + token for token in tokens]
+    features += [f"b:{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    for feature in features:
+        bucket = _bucket(feature)
+        vector[bucket] = vector.get(bucket, 0.0) + 1.0
+
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if norm:
+        for bucket in vector:
+            vector[bucket] /= norm
+    return vector
+
+
+# One-permutation MinHash: a single hash h(x) = (a * x + b) mod p whose range is
+# split into bins, keeping the minimum per bin. Fixed so keys stay valid across processes.
+_PRIME = (1 << 61) - 1
+_HASH_A, _HASH_B = 1_103_515_245_123, 12_345_678_901
+
+
+def lsh_keys(vector: Vector, bands: int = 12, rows: int = 3) -> List[int]:
+    """
+    Locality-sensitive keys for a vector: one per band of rows MinHashes.
+
+    Vectors whose feature sets overlap heavily share at least one key with
+    high probability (Jaccard 0.8: ~100%, 0.3: ~28% with the defaults), so
+    candidates can be fetched by key and then compared with cosine.
+    """
+    if not vector:
+        return []
+    bins = bands * rows
+    signature = [_PRIME] * bins
+    for feature in vector:
+        h = (_HASH_A * feature + _HASH_B) % _PRIME
+        slot = h % bins
+        if h < signature[slot]:
+            signature[slot] = h
+    return [
+        zlib.crc32(f"{band}:{signature[band * rows:(band + 1) * rows]}".encode("utf-8"))
+        for band in range(bands)
+    ]
+
+
+def cosine(a: Vector, b: Vector) -> float:
+    """Cosine similarity of two normalized vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(bucket, 0.0) for bucket, weight in a.items())
@@ -0,0 +1,471 @@
+"""
+Instrumentation for the research workflow.
+
+Each graph node runs inside a span that records its duration, the LLM tokens
+consumed, tool calls made and cache hits served while it was active. Finished
+spans are appended to a JSONL trace file (when tracing is configured) and
+folded into an in-process metrics registry of counters and histograms.
+
+LLM and tool activity is captured by a LangChain callback handler that is
+injected into every run started inside a span, so node code does not have to
+pass callbacks around.
+"""
+import os
+import json
+import time
+import uuid
+import inspect
+import functools
+import threading
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class Histogram:
+    """Bucketed histogram that also keeps recent samples for percentiles."""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS, max_samples: int = 10000):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self._samples = deque(maxlen=max_samples)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self._samples.append(value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                return
+        self.bucket_counts[-1] += 1
+
+    def percentile(self, q: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "min": round(self.min, 6),
+            "max": round(self.max, 6),
+            "mean": round(self.total / self.count, 6),
+            "p50": round(self.percentile(0.5), 6),
+            "p95": round(self.percentile(0.95), 6),
+            "buckets": {
+                **{f"le_{bound}": n for bound, n in zip(self.buckets, self.bucket_counts)},
+                "le_inf": self.bucket_counts[-1],
+            },
+        }
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._histograms: Dict[str, Histogram] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(value)
+
+    def counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def histogram(self, name: str) -> Optional[dict]:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            return histogram.summary() if histogram else None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {name: h.summary() for name, h in self._histograms.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class TraceWriter:
+    """Appends finished spans to a JSONL file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line)
+
+
+class Span:
+    """A timed unit of work (a graph node, a subagent, ...)."""
+
+    def __init__(self, name: str, kind: str = "node", parent: Optional["Span"] = None, **attributes: Any):
+        self.name = name
+        self.kind = kind
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.llm_calls = 0
+        self.tool_calls: Dict[str, int] = defaultdict(int)
+        self.events: Dict[str, int] = defaultdict(int)
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.time()) - self.start
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "end": self.end,
+            "duration_s": round(self.duration, 6),
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "llm_calls": self.llm_calls,
+            "tool_calls": dict(self.tool_calls),
+            "events": dict(self.events),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+def _usage_from_result(response: Any) -> tuple:
+    """Extract (input, output) token counts from an LLMResult."""
+    tokens_in = tokens_out = 0
+    for generations in getattr(response, "generations", []) or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                tokens_in += usage.get("input_tokens", 0)
+                tokens_out += usage.get("output_tokens", 0)
+    if not (tokens_in or tokens_out):
+        token_usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        tokens_in = token_usage.get("prompt_tokens", 0)
+        tokens_out = token_usage.get("completion_tokens", 0)
+    return tokens_in, tokens_out
+
+
+class SpanCallbackHandler(BaseCallbackHandler):
+    """Attributes LLM tokens and tool calls to the span that is active when they run."""
+
+    def __init__(self, span: Span):
+        self.span = span
+
+    def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        tokens_in, tokens_out = _usage_from_result(response)
+        with self.span._lock:
+            self.span.llm_calls += 1
+            self.span.tokens_in += tokens_in
+            self.span.tokens_out += tokens_out
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        with self.span._lock:
+            self.span.tool_calls[name] += 1
+
+
+class SubagentProfiler(BaseCallbackHandler):
+    """
+    Records every LLM step and tool invocation of one ReAct subagent.
+    
+    Attach it through the run config's callbacks; profile() aggregates the
+    recorded steps per tool and keeps the raw timeline for flamegraph dumps.
+    """
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.steps: List[dict] = []
+        self._open: Dict[Any, dict] = {}
+        self._lock = threading.Lock()
+
+    def _begin(self, run_id: Any, kind: str, name: str, input_chars: int = 0) -> None:
+        with self._lock:
+            self._open[run_id] = {
+                "type": kind,
+                "name": name,
+                "start": time.time(),
+                "input_chars": input_chars,
+            }
+
+    def _finish(self, run_id: Any, **fields: Any) -> None:
+        with self._lock:
+            step = self._open.pop(run_id, None)
+            if step is None:
+                return
+            step["end"] = time.time()
+            step["duration_s"] = round(step["end"] - step["start"], 6)
+            step.update(fields)
+            self.steps.append(step)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: Any, **kwargs: Any) -> None:
+        chars = sum(len(str(getattr(m, "content", m))) for batch in messages for m in batch)
+        self._begin(run_id, "llm", (serialized or {}).get("name") or "llm", chars)
+
+    def on_llm_end(self, response: Any, *, run_id: Any, **kwargs: Any) -> None:
+        tokens_in, tokens_out = _usage_from_result(response)
+        self._finish(run_id, tokens_in=tokens_in, tokens_out=tokens_out)
+
+    def on_llm_error(self, error: BaseException, *, run_id: Any, **kwargs: Any) -> None:
+        self._finish(run_id, error=f"{type(error).__name__}: {error}")
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: Any, **kwargs: Any) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._begin(run_id, "tool", name, len(input_str or ""))
+
+    def on_tool_end(self, output: Any, *, run_id: Any, **kwargs: Any) -> None:
+        self._finish(run_id, output_chars=len(str(getattr(output, "content", output))))
+
+    def on_tool_error(self, error: BaseException, *, run_id: Any, **kwargs: Any) -> None:
+        self._finish(run_id, error=f"{type(error).__name__}: {error}")
+
+    def profile(self) -> dict:
+        """Aggregate the recorded steps into a per-task profile."""
+        end = self.end or time.time()
+        with self._lock:
+            steps = sorted(self.steps, key=lambda step: step["start"])
+
+        tools: Dict[str, dict] = {}
+        for step in steps:
+            if step["type"] != "tool":
+                continue
+            stats = tools.setdefault(step["name"], {"count": 0, "total_s": 0.0, "max_s": 0.0, "output_chars": 0, "errors": 0})
+            stats["count"] += 1
+            stats["total_s"] = round(stats["total_s"] + step["duration_s"], 6)
+            stats["max_s"] = max(stats["max_s"], step["duration_s"])
+            stats["output_chars"] += step.get("output_chars", 0)
+            stats["errors"] += 1 if step.get("error") else 0
+
+        llm_steps = [step for step in steps if step["type"] == "llm"]
+        return {
+            "task_id": self.task_id,
+            "start": self.start,
+            "wall_s": round(end - self.start, 6),
+            "llm_steps": len(llm_steps),
+            "llm_time_s": round(sum(step["duration_s"] for step in llm_steps), 6),
+            "tokens_in": sum(step.get("tokens_in", 0) for step in llm_steps),
+            "tokens_out": sum(step.get("tokens_out", 0) for step in llm_steps),
+            "tool_calls": tools,
+            "timeline": steps,
+        }
+
+
+def write_timeline(profiles: List[dict], path: str) -> str:
+    """
+    Dump subagent profiles as a Chrome trace-event file.
+    
+    Open it in chrome://tracing, Perfetto or speedscope for a flamegraph-style
+    view: one row per subagent, with its LLM steps and tool calls nested under it.
+    """
+    events = []
+    for tid, profile in enumerate(profiles, 1):
+        events.append({
+            "name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+            "args": {"name": profile["task_id"]},
+        })
+        events.append({
+            "name": profile["task_id"], "cat": "subagent", "ph": "X", "pid": 1, "tid": tid,
+            "ts": int(profile["start"] * 1e6), "dur": int(profile["wall_s"] * 1e6),
+        })
+        for step in profile["timeline"]:
+            events.append({
+                "name": step["name"], "cat": step["type"], "ph": "X", "pid": 1, "tid": tid,
+                "ts": int(step["start"] * 1e6), "dur": int(step["duration_s"] * 1e6),
+                "args": {k: v for k, v in step.items() if k not in ("name", "type", "start", "end", "duration_s")},
+            })
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return path
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("research_current_span", default=None)
+_span_handler: ContextVar[Optional[SpanCallbackHandler]] = ContextVar("research_span_handler", default=None)
+register_configure_hook(_span_handler, inheritable=True)
+
+_metrics = MetricsRegistry()
+_trace_writer: Optional[TraceWriter] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return _metrics
+
+
+def configure_tracing(path: Optional[str]) -> None:
+    """Write finished spans to path as JSONL (None disables the trace file)."""
+    global _trace_writer
+    _trace_writer = TraceWriter(path) if path else None
+
+
+def tracing_enabled() -> bool:
+    """Whether a trace file is configured."""
+    return _trace_writer is not None
+
+
+def current_span() -> Optional[Span]:
+    """The span active in the current context, if any."""
+    return _current_span.get()
+
+
+def record_event(name: str, value: int = 1) -> None:
+    """Count an event (e.g. a cache hit) on the active span and in the metrics registry."""
+    span = _current_span.get()
+    if span is not None:
+        with span._lock:
+            span.events[name] += value
+    _metrics.increment(f"events.{name}", value)
+
+
+def record_provenance(name: str, **details: Any) -> None:
+    """
+    Count an event and note where its result came from on the active span.
+    
+    Used for responses served from somewhere other than the provider (e.g. a
+    semantic cache hit); details land in the span's "provenance" attribute.
+    """
+    span = _current_span.get()
+    if span is not None:
+        with span._lock:
+            span.attributes.setdefault("provenance", []).append({"event": name, **details})
+    record_event(name)
+
+
+def start_span(name: str, kind: str = "node", **attributes: Any) -> tuple:
+    """Open a span as a child of the active one and make it current."""
+    span = Span(name, kind=kind, parent=_current_span.get(), **attributes)
+    tokens = (_current_span.set(span), _span_handler.set(SpanCallbackHandler(span)))
+    return span, tokens
+
+
+def finish_span(span: Span, tokens: tuple, error: Optional[BaseException] = None) -> None:
+    """Close a span, restore the previous one and publish it."""
+    span.end = time.time()
+    if error is not None:
+        span.status = "error"
+        span.error = f"{type(error).__name__}: {error}"
+    _current_span.reset(tokens[0])
+    _span_handler.reset(tokens[1])
+
+    # Roll usage up so a node's span covers the work of its children
+    parent = _current_span.get()
+    if parent is not None and parent.span_id == span.parent_id:
+        with parent._lock:
+            parent.tokens_in += span.tokens_in
+            parent.tokens_out += span.tokens_out
+            parent.llm_calls += span.llm_calls
+            for tool_name, count in span.tool_calls.items():
+                parent.tool_calls[tool_name] += count
+            for event, count in span.events.items():
+                parent.events[event] += count
+
+    prefix = f"{span.kind}.{span.name}"
+    _metrics.observe(f"{prefix}.latency_s", span.duration)
+    _metrics.increment(f"{prefix}.tokens_in", span.tokens_in)
+    _metrics.increment(f"{prefix}.tokens_out", span.tokens_out)
+    _metrics.increment(f"{prefix}.tool_calls", sum(span.tool_calls.values()))
+    if error is not None:
+        _metrics.increment(f"{prefix}.errors")
+
+    if _trace_writer is not None:
+        _trace_writer.write(span.to_dict())
+
+
+def instrument_node(name: str, node: Callable) -> Callable:
+    """Wrap a LangGraph node (sync or async) so each call runs in its own span."""
+    if inspect.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def async_wrapper(*args, **kwargs):
+            span, tokens = start_span(name)
+            try:
+                result = await node(*args, **kwargs)
+            except BaseException as e:
+                finish_span(span, tokens, e)
+                raise
+            finish_span(span, tokens)
+            return result
+        return async_wrapper
+
+    @functools.wraps(node)
+    def wrapper(*args, **kwargs):
+        span, tokens = start_span(name)
+        try:
+            result = node(*args, **kwargs)
+        except BaseException as e:
+            finish_span(span, tokens, e)
+            raise
+        finish_span(span, tokens)
+        return result
+    return wrapper
+
+
+def format_metrics_summary(snapshot: Optional[dict] = None) -> str:
+    """Human-readable per-node summary of the metrics registry."""
+    snapshot = snapshot or _metrics.snapshot()
+    counters = snapshot["counters"]
+    lines = []
+    for name, histogram in sorted(snapshot["histograms"].items()):
+        if not name.endswith(".latency_s"):
+            continue
+        prefix = name[: -len(".latency_s")]
+        lines.append(
+            f"{prefix}: {histogram['count']} calls, {histogram['sum']:.2f}s total, "
+            f"p95 {histogram['p95']:.2f}s, tokens {int(counters.get(prefix + '.tokens_in', 0))} in / "
+            f"{int(counters.get(prefix + '.tokens_out', 0))} out, "
+            f"{int(counters.get(prefix + '.tool_calls', 0))} tool calls"
+        )
+    events = {k[len("events."):]: int(v) for k, v in counters.items() if k.startswith("events.")}
+    if events:
+        lines.append("events: " + ", ".join(f"{k}={v}" for k, v in sorted(events.items())))
+    return "\n".join(lines)
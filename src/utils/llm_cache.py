@@ -0,0 +1,400 @@
+"""
+LLM response caches.
+
+Both plug into LangChain's cache hook on chat models (the `cache` field):
+- SQLiteLLMCache skips the provider call whenever the provider, model
+  settings and fully rendered messages match a previous call.
+- SemanticLLMCache (opt-in) also serves prompts that are near-identical to
+  a cached one, e.g. subagent ReAct turns with the same objective template
+  and search results, found through a locality-sensitive index on disk.
+
+Configuration (environment variables):
+- LLM_CACHE_PATH: SQLite file location
+- LLM_CACHE_TTL: Entry lifetime in seconds (default: 604800)
+- LLM_CACHE_MAX_ENTRIES: Maximum number of cached responses (default: 2000)
+- LLM_CACHE_DISABLED: Set to "1" to bypass the cache entirely
+- LLM_SEMANTIC_CACHE: Set to "1" to enable the semantic cache for subagents
+- LLM_SEMANTIC_CACHE_PATH: SQLite file location of the semantic cache
+- LLM_SEMANTIC_CACHE_THRESHOLD: Cosine similarity needed for a hit (default: 0.97)
+- LLM_SEMANTIC_CACHE_MAX_ENTRIES: Maximum number of semantic entries (default: 2000)
+"""
+import os
+import re
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+from src.utils.embeddings import Vector, cosine, embed_document, lsh_keys
+from src.utils.instrumentation import record_event, record_provenance
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "deep-research-agent", "llm_cache.sqlite"
+)
+DEFAULT_SEMANTIC_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "deep-research-agent", "llm_semantic_cache.sqlite"
+)
+
+
+class SQLiteLLMCache(BaseCache):
+    """SQLite-backed LLM response cache with TTL expiry and LRU eviction."""
+
+    def __init__(self, path: str, ttl: float = 604800, max_entries: int = 2000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                generations TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return cached generations for the prompt, or None on a miss."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generations, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            generations, created_at = row
+            if now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        record_event("llm_cache_hit")
+        return loads(generations, allowed_objects="core")
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store generations and evict expired or least recently used entries."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, generations, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, dumps(return_val), now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,)
+            )
+            self._conn.execute(
+                """DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Timestamps in prompts (e.g. the subagent's current date) don't change what is asked
+_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?")
+
+
+def _message_text(kwargs: dict) -> str:
+    content = kwargs.get("content", "")
+    if isinstance(content, list):
+        content = " ".join(
+            block.get("text", "") if isinstance(block, dict) else str(block) for block in content
+        )
+    parts = [str(content)]
+    for tool_call in kwargs.get("tool_calls", []) or []:
+        parts.append(f"{tool_call.get('name', '')} {json.dumps(tool_call.get('args', {}), sort_keys=True)}")
+    return "\n".join(parts)
+
+
+def _prompt_parts(prompt: str) -> Tuple[str, str, str]:
+    """
+    Split a rendered chat prompt into (instructions, conversation, role sequence).
+
+    Chat models pass the cache their messages serialized with dumps(). The
+    instructions (leading system messages and the first human message, i.e.
+    the task) must match exactly, apart from timestamps, and so must the role
+    sequence, so a reply is never reused for a different task or a longer or
+    shorter ReAct history. Only the conversation that follows (tool results
+    and the model's own turns) is compared by similarity.
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return "", prompt, ""
+    if not isinstance(messages, list):
+        return "", prompt, ""
+
+    instructions, conversation, roles = [], [], []
+    for message in messages:
+        kwargs = message.get("kwargs", {}) if isinstance(message, dict) else {}
+        role = str(kwargs.get("type") or message.get("id", ["?"])[-1])
+        leading = not conversation and (role == "system" or (role == "human" and "human" not in roles))
+        (instructions if leading else conversation).append(_message_text(kwargs))
+        roles.append(role)
+    return _TIMESTAMP.sub("<time>", "\n".join(instructions)), "\n".join(conversation), ",".join(roles)
+
+
+def _pack(vector: Vector) -> bytes:
+    buckets = array("I", vector.keys())
+    weights = array("f", vector.values())
+    return zlib.compress(buckets.tobytes() + weights.tobytes())
+
+
+def _unpack(data: bytes) -> Vector:
+    raw = zlib.decompress(data)
+    half = len(raw) // 2
+    buckets, weights = array("I"), array("f")
+    buckets.frombytes(raw[:half])
+    weights.frombytes(raw[half:])
+    return dict(zip(buckets, weights))
+
+
+class SemanticLLMCache(BaseCache):
+    """
+    LLM response cache that also serves near-identical prompts.
+
+    Exact matches are answered by the wrapped exact cache first. Otherwise
+    candidates must have the same model settings, task instructions and
+    message-role sequence (see _prompt_parts). Their conversations (tool
+    results and earlier turns) are embedded locally (src.utils.embeddings).
+    Candidates sharing a MinHash band key are read from an on-disk SQLite
+    index and compared by cosine similarity. The best one at or above
+    threshold is returned, and the hit is recorded on the active span with
+    its provenance (similarity, cached entry and when it was stored).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        exact: Optional[SQLiteLLMCache] = None,
+        threshold: float = 0.97,
+        ttl: float = 604800,
+        max_entries: int = 2000
+    ):
+        self.path = path
+        self.exact = exact
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # A miss is followed by an update for the same prompt; embed it once
+        self._recent: "OrderedDict[str, tuple]" = OrderedDict()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS semantic_llm_cache (
+                id INTEGER PRIMARY KEY,
+                scope TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                generations TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_semantic_llm_cache_accessed ON semantic_llm_cache (accessed_at)"
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS semantic_llm_keys (
+                key INTEGER NOT NULL,
+                entry_id INTEGER NOT NULL,
+                PRIMARY KEY (key, entry_id)
+            ) WITHOUT ROWID"""
+        )
+
+    def _analyze(self, prompt: str, llm_string: str) -> Tuple[str, str, Vector, List[int]]:
+        """The prompt's (hash, scope, conversation vector, index keys)."""
+        prompt_hash = hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+        with self._lock:
+            if prompt_hash in self._recent:
+                return self._recent[prompt_hash]
+
+        instructions, conversation, roles = _prompt_parts(prompt)
+        scope = hashlib.sha256(f"{llm_string}\n{roles}\n{instructions}".encode("utf-8")).hexdigest()
+        vector = embed_document(conversation or instructions)
+        keys = [
+            int.from_bytes(hashlib.blake2b(f"{scope}:{key}".encode("utf-8"), digest_size=7).digest(), "big")
+            for key in lsh_keys(vector)
+        ]
+        analysis = (prompt_hash, scope, vector, keys)
+        with self._lock:
+            self._recent[prompt_hash] = analysis
+            while len(self._recent) > 64:
+                self._recent.popitem(last=False)
+        return analysis
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return cached generations for the prompt or a near-identical one, or None."""
+        if self.exact is not None:
+            cached = self.exact.lookup(prompt, llm_string)
+            if cached is not None:
+                return cached
+
+        _, scope, vector, keys = self._analyze(prompt, llm_string)
+        if not keys:
+            return None
+
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT DISTINCT e.id, e.prompt_hash, e.vector, e.generations, e.created_at
+                    FROM semantic_llm_keys k JOIN semantic_llm_cache e ON e.id = k.entry_id
+                    WHERE k.key IN ({",".join("?" * len(keys))}) AND e.scope = ? AND e.created_at >= ?""",
+                (*keys, scope, now - self.ttl)
+            ).fetchall()
+
+            best = None
+            for entry_id, prompt_hash, packed, generations, created_at in rows:
+                similarity = cosine(vector, _unpack(packed))
+                if similarity >= self.threshold and (best is None or similarity > best[0]):
+                    best = (similarity, entry_id, prompt_hash, generations, created_at)
+            if best is None:
+                return None
+
+            similarity, entry_id, prompt_hash, generations, created_at = best
+            self._conn.execute(
+                "UPDATE semantic_llm_cache SET accessed_at = ? WHERE id = ?", (now, entry_id)
+            )
+
+        record_provenance(
+            "llm_semantic_hit",
+            similarity=round(similarity, 4),
+            entry_id=entry_id,
+            source_prompt=prompt_hash[:16],
+            cached_at=created_at
+        )
+        return loads(generations, allowed_objects="core")
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store generations under the prompt's embedding and evict old entries."""
+        if self.exact is not None:
+            self.exact.update(prompt, llm_string, return_val)
+
+        prompt_hash, scope, vector, keys = self._analyze(prompt, llm_string)
+        if not keys:
+            return
+
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO semantic_llm_cache (scope, prompt_hash, vector, generations, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (scope, prompt_hash, _pack(vector), dumps(return_val), now, now)
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO semantic_llm_keys (key, entry_id) VALUES (?, ?)",
+                [(key, cursor.lastrowid) for key in keys]
+            )
+
+            evicted = self._conn.execute(
+                "DELETE FROM semantic_llm_cache WHERE created_at < ?", (now - self.ttl,)
+            ).rowcount
+            evicted += self._conn.execute(
+                """DELETE FROM semantic_llm_cache WHERE id IN (
+                    SELECT id FROM semantic_llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            ).rowcount
+            if evicted:
+                self._conn.execute(
+                    "DELETE FROM semantic_llm_keys WHERE entry_id NOT IN (SELECT id FROM semantic_llm_cache)"
+                )
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every cached response (including the wrapped exact cache)."""
+        if self.exact is not None:
+            self.exact.clear()
+        with self._lock:
+            self._conn.execute("DELETE FROM semantic_llm_keys")
+            self._conn.execute("DELETE FROM semantic_llm_cache")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[SQLiteLLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[SQLiteLLMCache]:
+    """Get the process-wide LLM response cache, or None if caching is disabled."""
+    global _cache
+
+    if os.getenv("LLM_CACHE_DISABLED") == "1":
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = SQLiteLLMCache(
+                path=os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+                ttl=float(os.getenv("LLM_CACHE_TTL", "604800")),
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+            )
+        return _cache
+
+
+_semantic_cache: Optional[SemanticLLMCache] = None
+
+
+def get_semantic_llm_cache() -> Optional[SemanticLLMCache]:
+    """Get the process-wide semantic LLM cache, or None unless LLM_SEMANTIC_CACHE=1."""
+    global _semantic_cache
+
+    if os.getenv("LLM_SEMANTIC_CACHE") != "1" or os.getenv("LLM_CACHE_DISABLED") == "1":
+        return None
+
+    exact = get_llm_cache()
+    with _cache_lock:
+        if _semantic_cache is None:
+            _semantic_cache = SemanticLLMCache(
+                path=os.getenv("LLM_SEMANTIC_CACHE_PATH", DEFAULT_SEMANTIC_CACHE_PATH),
+                exact=exact,
+                threshold=float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", "0.97")),
+                ttl=float(os.getenv("LLM_CACHE_TTL", "604800")),
+                max_entries=int(os.getenv("LLM_SEMANTIC_CACHE_MAX_ENTRIES", "2000"))
+            )
+        return _semantic_cache
@@ -2,13 +2,38 @@
 LLM Provider abstraction for multi-provider support.
 """
 import os
-from typing import Optional, List, Any
+import threading
+from typing import Optional, List, Any, Dict, Hashable, Tuple
 from langchain_core.language_models import BaseChatModel
+from src.utils.rate_limit import get_rate_limiter
+from src.utils.llm_cache import get_llm_cache, get_semantic_llm_cache
+
+# Model instances keyed on (provider, model, temperature, kwargs). Reusing an
+# instance reuses its SDK client and the provider's pooled HTTP connections.
+_registry: Dict[Hashable, BaseChatModel] = {}
+_registry_lock = threading.Lock()
+
+def _freeze(value: Any) -> Hashable:
+    """Turn kwargs values into a hashable registry key component."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        # Keying on id() would give every such object its own permanent entry
+        raise TypeError(
+            f"get_llm arguments must be hashable (or dicts/lists of hashable values), got {type(value).__name__}"
+        ) from None
+    return value
 
 def get_llm(
     provider: str = "openai",
     model: Optional[str] = None,
     temperature: float = 0.7,
+    use_cache: bool = False,
+    semantic_cache: bool = False,
     **kwargs
 ) -> BaseChatModel:
     """
@@ -18,13 +43,87 @@ def get_llm(
         provider: 'openai', 'anthropic', or 'google'
         model: Model name (uses defaults if not specified)
         temperature: Sampling temperature
+        use_cache: Serve exact repeats of a prompt from the LLM response cache
+        semantic_cache: With use_cache, serve near-identical prompts from the
+            semantic cache instead; no caching unless LLM_SEMANTIC_CACHE=1
         **kwargs: Additional provider-specific arguments
     
     Returns:
-        A LangChain chat model instance
+        A LangChain chat model instance, shared with every other caller that
+        asks for the same configuration
     """
     provider = provider.lower()
     
+    # Share the provider's token bucket across every model instance
+    rate_limiter = get_rate_limiter(provider)
+    if rate_limiter is not None:
+        kwargs.setdefault("rate_limiter", rate_limiter)
+    
+    if use_cache:
+        llm_cache = get_semantic_llm_cache() if semantic_cache else get_llm_cache()
+        if llm_cache is not None:
+            kwargs.setdefault("cache", llm_cache)
+    
+    key = (provider, model, temperature, _freeze(kwargs))
+    with _registry_lock:
+        llm = _registry.get(key)
+        if llm is None:
+            llm = _create_llm(provider, model, temperature, **kwargs)
+            _registry[key] = llm
+        return llm
+
+def _owned_clients(llm: BaseChatModel) -> Tuple[List[Any], List[Any]]:
+    """
+    The SDK clients that belong to one model instance, as (sync, async) lists.
+    
+    Only Gemini's google-genai Client (whose .aio is the async side) is built
+    per instance. langchain-openai and langchain-anthropic hand every instance
+    the same process-wide cached httpx clients, so closing those would break
+    the models get_llm builds afterwards; their instances are only dropped.
+    """
+    genai = llm.__dict__.get("client")
+    if genai is None or not hasattr(genai, "aio"):
+        return [], []
+    return [genai], [genai.aio]
+
+def _take_registry() -> List[BaseChatModel]:
+    with _registry_lock:
+        llms = list(_registry.values())
+        _registry.clear()
+    return llms
+
+def _close_sync(client: Any) -> None:
+    try:
+        client.close()
+    except Exception:
+        pass
+
+def close_llms() -> None:
+    """
+    Drop every registered model instance and close the sync SDK clients it owns.
+    
+    Subsequent get_llm calls build fresh instances. Call this on shutdown or
+    after changing provider credentials; from a running event loop use
+    aclose_llms, which also closes the async clients.
+    """
+    for llm in _take_registry():
+        for client in _owned_clients(llm)[0]:
+            _close_sync(client)
+
+async def aclose_llms() -> None:
+    """Drop every registered model instance and close the sync and async SDK clients it owns."""
+    for llm in _take_registry():
+        sync, async_ = _owned_clients(llm)
+        for client in sync:
+            _close_sync(client)
+        for client in async_:
+            try:
+                await (client.aclose() if hasattr(client, "aclose") else client.close())
+            except Exception:
+                pass
+
+def _create_llm(provider: str, model: Optional[str], temperature: float, **kwargs) -> BaseChatModel:
+    """Construct a new chat model for the provider."""
     if provider == "openai":
         from langchain_openai import ChatOpenAI
         model = model or "gpt-4o"
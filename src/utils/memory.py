@@ -2,18 +2,29 @@
 Memory module for persisting research plans and progress to markdown files.
 """
 import os
+import re
+import json
+import mmap
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from src.state.schema import ResearchPlan, SubagentResult
 
+# Every iteration section in the progress journal starts with this line
+ITERATION_MARKER = b"\n## Iteration "
+# Heading of one subagent result in an iteration section
+RESULT_HEADING = re.compile(r"^#### (.+)\n\*\*Confidence\*\*: ", re.MULTILINE)
+
 class MemoryStore:
     """Manages markdown-based memory for research sessions."""
     
-    def __init__(self, output_dir: str, conversation_id: str):
+    def __init__(self, output_dir: str, conversation_id: str, fsync: Optional[str] = None):
         self.output_dir = output_dir
         self.conversation_id = conversation_id
         self.plan_file = os.path.join(output_dir, f"research_plan_{conversation_id}.md")
         self.progress_file = os.path.join(output_dir, f"research_progress_{conversation_id}.md")
+        self.progress_index_file = os.path.join(output_dir, f"research_progress_{conversation_id}.idx")
+        # 'always' fsyncs every journal append, 'never' leaves flushing to the OS
+        self.fsync = fsync or os.getenv("MEMORY_FSYNC", "never")
         
         # Ensure output directory exists
         os.makedirs(output_dir, exist_ok=True)
@@ -47,28 +58,76 @@ class MemoryStore:
         return self.plan_file
     
     def update_progress(self, iteration: int, results: List[SubagentResult], synthesis: str = "") -> str:
-        """Update the progress file with subagent results."""
-        # Read existing content or start new
-        if os.path.exists(self.progress_file):
-            with open(self.progress_file, 'r') as f:
-                content = f.read()
-        else:
-            content = f"""# Research Progress
-**Session**: {self.conversation_id}
-**Started**: {datetime.now().isoformat()}
-
----
-"""
+        """
+        Append an iteration to the progress journal.
+        
+        The journal is only ever appended to; the byte offset of each iteration
+        is recorded in a sidecar index so readers can seek straight to it.
+        """
+        section = self._iteration_header(iteration)
+        for result in results:
+            section += self._format_result(result)
+        section += self._iteration_footer(synthesis)
         
-        # Add new iteration
-        content += f"""
+        offset, length = self._append(section)
+        self._index_iteration(iteration, offset, length)
+        
+        return self.progress_file
+    
+    def begin_iteration(self, iteration: int) -> int:
+        """
+        Open an iteration in the progress journal for results written as they arrive.
+        
+        Follow with append_result() per result and close with finish_iteration(),
+        passing it the journal offset returned here; the iteration is only added
+        to the index once it is finished.
+        
+        If the journal ends in an unfinished section for the same iteration
+        (the node writing it was retried or resumed), that section is reopened
+        rather than started again; see recorded_task_ids.
+        """
+        offset = self._open_iteration(iteration)
+        if offset is None:
+            offset, _ = self._append(self._iteration_header(iteration))
+        return offset
+    
+    def recorded_task_ids(self, offset: int) -> set:
+        """Task IDs of the results already written to the iteration opened at offset."""
+        if not os.path.exists(self.progress_file):
+            return set()
+        with open(self.progress_file, 'rb') as f:
+            f.seek(offset)
+            section = f.read().decode("utf-8", errors="replace")
+        return set(RESULT_HEADING.findall(section))
+    
+    def append_result(self, result: SubagentResult) -> None:
+        """Append one subagent result to the open iteration."""
+        self._append(self._format_result(result))
+    
+    def finish_iteration(self, iteration: int, offset: Optional[int], synthesis: str = "") -> str:
+        """
+        Close the open iteration with its synthesis and index it.
+        
+        offset is the value begin_iteration returned. Without it the iteration
+        is left out of the index, and readers fall back to scanning the journal.
+        """
+        end, length = self._append(self._iteration_footer(synthesis))
+        if offset is not None:
+            self._index_iteration(iteration, offset, end + length - offset)
+        return self.progress_file
+    
+    @staticmethod
+    def _iteration_header(iteration: int) -> str:
+        return f"""
 ## Iteration {iteration}
 **Time**: {datetime.now().strftime('%H:%M:%S')}
 
 ### Subagent Results
 """
-        for result in results:
-            content += f"""
+    
+    @staticmethod
+    def _format_result(result: SubagentResult) -> str:
+        section = f"""
 #### {result.task_id}
 **Confidence**: {result.confidence:.0%}
 
@@ -77,44 +136,184 @@ class MemoryStore:
 
 **Sources**:
 """
-            for src in result.sources:
-                content += f"- [{src.get('title', 'Unknown')}]({src.get('url', '#')})\n"
-            
-            if result.gaps:
-                content += "\n**Gaps Identified**:\n"
-                for gap in result.gaps:
-                    content += f"- {gap}\n"
+        for src in result.sources:
+            section += f"- [{src.get('title', 'Unknown')}]({src.get('url', '#')})\n"
         
+        if result.gaps:
+            section += "\n**Gaps Identified**:\n"
+            for gap in result.gaps:
+                section += f"- {gap}\n"
+        return section
+    
+    @staticmethod
+    def _iteration_footer(synthesis: str) -> str:
+        section = ""
         if synthesis:
-            content += f"""
+            section += f"""
 ### Synthesis
 {synthesis}
 """
+        return section + "\n---\n"
+    
+    def _open_iteration(self, iteration: int) -> Optional[int]:
+        """
+        Offset of an unfinished section for iteration at the end of the journal, if any.
         
-        content += "\n---\n"
+        Sections are appended back to back, so an unfinished one starts where
+        the last indexed iteration ends (or at the first header of the journal).
+        """
+        if not os.path.exists(self.progress_file):
+            return None
+        if not os.path.exists(self.progress_index_file):
+            self._rebuild_progress_index()
         
-        with open(self.progress_file, 'w') as f:
-            f.write(content)
+        entries = self._read_index_tail(1)
+        header = ITERATION_MARKER + f"{iteration}\n".encode("utf-8")
+        with open(self.progress_file, 'rb') as f:
+            if entries:
+                offset = entries[-1]["offset"] + entries[-1]["length"]
+            else:
+                offset = f.read(4096).find(ITERATION_MARKER)
+                if offset == -1:
+                    return None
+            f.seek(offset)
+            return offset if f.read(len(header)) == header else None
+    
+    def _append(self, section: str) -> Tuple[int, int]:
+        """Append text to the journal, returning its (offset, length) in bytes."""
+        # Journals written before the index existed get one full scan, then stay indexed
+        if os.path.exists(self.progress_file) and not os.path.exists(self.progress_index_file):
+            self._rebuild_progress_index()
         
-        return self.progress_file
+        with open(self.progress_file, 'ab') as f:
+            if f.tell() == 0:
+                f.write(f"""# Research Progress
+**Session**: {self.conversation_id}
+**Started**: {datetime.now().isoformat()}
+
+---
+""".encode("utf-8"))
+            offset = f.tell()
+            data = section.encode("utf-8")
+            f.write(data)
+            self._sync(f)
+        
+        # A new journal starts with an (empty) index, so an open iteration isn't taken for a legacy file
+        if not os.path.exists(self.progress_index_file):
+            open(self.progress_index_file, 'a').close()
+        return offset, len(data)
+    
+    def _index_iteration(self, iteration: int, offset: int, length: int) -> None:
+        with open(self.progress_index_file, 'a') as f:
+            f.write(json.dumps({"iteration": iteration, "offset": offset, "length": length}) + "\n")
+            self._sync(f)
     
-    def get_context(self) -> str:
-        """Retrieve context from memory files for context window management."""
+    def _sync(self, f) -> None:
+        """Flush a journal file, forcing it to disk when the fsync policy asks for it."""
+        f.flush()
+        if self.fsync == "always":
+            os.fsync(f.fileno())
+    
+    def _read_index_tail(self, count: int) -> List[dict]:
+        """
+        Read the last count entries of the progress index.
+        
+        The index is read backwards in blocks, so the cost depends on how many
+        entries are requested rather than how many iterations have been written.
+        """
+        if not os.path.exists(self.progress_index_file):
+            return []
+        
+        with open(self.progress_index_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            block = 512 * count
+            while True:
+                start = max(0, end - block)
+                f.seek(start)
+                lines = f.read(end - start).splitlines()
+                if start > 0:
+                    lines = lines[1:]  # First line may be cut in half
+                lines = [line for line in lines if line.strip()]
+                if len(lines) >= count or start == 0:
+                    return [json.loads(line) for line in lines[-count:]]
+                block *= 2
+    
+    def _scan_iteration_offsets(self, count: Optional[int] = None) -> List[int]:
+        """
+        Find iteration offsets directly in the progress journal.
+        
+        Used when the sidecar index is missing or does not cover the whole
+        journal (e.g. files written before the index existed). With count set,
+        the memory-mapped file is searched backwards and only the tail is touched.
+        """
+        if os.path.getsize(self.progress_file) == 0:
+            return []
+        
+        with open(self.progress_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offsets = []
+            if count is None:
+                pos = mm.find(ITERATION_MARKER)
+                while pos != -1:
+                    offsets.append(pos)
+                    pos = mm.find(ITERATION_MARKER, pos + 1)
+            else:
+                end = len(mm)
+                while len(offsets) < count:
+                    pos = mm.rfind(ITERATION_MARKER, 0, end)
+                    if pos == -1:
+                        break
+                    offsets.insert(0, pos)
+                    end = pos
+            return offsets
+    
+    def _rebuild_progress_index(self) -> None:
+        """Recreate the sidecar index from the journal contents."""
+        offsets = self._scan_iteration_offsets()
+        size = os.path.getsize(self.progress_file)
+        with open(self.progress_index_file, 'w') as f:
+            for n, offset in enumerate(offsets):
+                end = offsets[n + 1] if n + 1 < len(offsets) else size
+                f.write(json.dumps({"iteration": n + 1, "offset": offset, "length": end - offset}) + "\n")
+    
+    def _tail_offsets(self, count: int) -> List[int]:
+        """Offsets of the last count iterations, trusting the index only if it is current."""
+        entries = self._read_index_tail(count)
+        if entries:
+            last = entries[-1]
+            if last["offset"] + last["length"] == os.path.getsize(self.progress_file):
+                return [entry["offset"] for entry in entries]
+        return self._scan_iteration_offsets(count)
+    
+    def get_context(self, last_iterations: int = 2) -> str:
+        """
+        Retrieve context from memory files for context window management.
+        
+        Only the last iterations of the progress journal are read, located
+        through the sidecar index (or a backwards scan if it is stale). With
+        last_iterations <= 0 the progress section is left out.
+        """
         context = ""
         
         if os.path.exists(self.plan_file):
             with open(self.plan_file, 'r') as f:
                 context += f"## Current Research Plan\n{f.read()}\n\n"
         
+        if last_iterations <= 0:
+            return context
+        
         if os.path.exists(self.progress_file):
-            with open(self.progress_file, 'r') as f:
-                progress = f.read()
-                # If progress is too long, summarize (keep last 2 iterations)
-                sections = progress.split("## Iteration")
-                if len(sections) > 3:
-                    context += f"## Research Progress (Last 2 Iterations)\n## Iteration{'## Iteration'.join(sections[-2:])}"
-                else:
-                    context += f"## Research Progress\n{progress}"
+            offsets = self._tail_offsets(last_iterations + 1)
+            # If progress is too long, summarize (keep last N iterations)
+            if len(offsets) > last_iterations:
+                with open(self.progress_file, 'rb') as f:
+                    # Skip the newline that opens each iteration section
+                    f.seek(offsets[-last_iterations] + 1)
+                    tail = f.read().decode("utf-8")
+                context += f"## Research Progress (Last {last_iterations} Iterations)\n{tail}"
+            else:
+                with open(self.progress_file, 'r') as f:
+                    context += f"## Research Progress\n{f.read()}"
         
         return context
     
@@ -0,0 +1,36 @@
+"""
+Per-provider token-bucket rate limiters for LLM and search calls.
+
+Limiters are shared process-wide so every subagent draws from the same
+bucket. A limiter is only created when its rate is configured:
+
+- <NAME>_REQUESTS_PER_SECOND: Sustained request rate (e.g. OPENAI_REQUESTS_PER_SECOND)
+- <NAME>_MAX_BURST: Bucket size, i.e. requests allowed in a burst (default: 1)
+
+where NAME is OPENAI, ANTHROPIC, GOOGLE or TAVILY.
+"""
+import os
+import threading
+from typing import Dict, Optional
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+_limiters: Dict[str, Optional[InMemoryRateLimiter]] = {}
+_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str) -> Optional[InMemoryRateLimiter]:
+    """Get the shared rate limiter for a provider, or None if it is unlimited."""
+    name = name.lower()
+
+    with _lock:
+        if name not in _limiters:
+            rate = float(os.getenv(f"{name.upper()}_REQUESTS_PER_SECOND", "0"))
+            if rate > 0:
+                _limiters[name] = InMemoryRateLimiter(
+                    requests_per_second=rate,
+                    check_every_n_seconds=min(0.1, 1 / rate),
+                    max_bucket_size=float(os.getenv(f"{name.upper()}_MAX_BURST", "1"))
+                )
+            else:
+                _limiters[name] = None
+        return _limiters[name]
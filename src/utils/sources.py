@@ -0,0 +1,118 @@
+"""
+Source registry for deduplicating citations across subagents and iterations.
+"""
+import hashlib
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from. Plain "ref" is not
+# one of them: sites such as GitHub use ?ref=<branch> to pick the content.
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "ref_src", "_ga", "_hsenc", "_hsmi",
+}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so links to the same page compare equal.
+
+    Lowercases the scheme and host, drops default ports, fragments, tracking
+    parameters and trailing slashes, and sorts the remaining query parameters.
+    """
+    url = url.strip()
+    if not url:
+        return ""
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url.lower()
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/")
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def _score(source: dict) -> float:
+    try:
+        return float(source.get("score") or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class SourceRegistry:
+    """
+    Ordered, deduplicated collection of sources.
+
+    Sources are keyed on their normalized URL. URL-less sources (an "AI
+    Summary" answer, a "No Results" placeholder) are keyed on title plus a
+    hash of their content, so only exact repeats of one are merged.
+    Citation numbers are assigned in first-seen order and never change when
+    duplicates are merged in:
+    - the longest snippet/content is kept
+    - the highest score is kept
+    - missing fields are filled from later duplicates
+    """
+
+    def __init__(self, sources: Optional[List[dict]] = None):
+        self._sources: List[dict] = []
+        self._index: Dict[str, int] = {}
+        for source in sources or []:
+            self.add(source)
+
+    @staticmethod
+    def key(source: dict) -> str:
+        """Dedup key for a source."""
+        url = normalize_url(source.get("url") or "")
+        if url:
+            return url
+        title = " ".join(str(source.get("title") or "").lower().split())
+        content = str(source.get("content") or source.get("snippet") or "")
+        return f"title:{title}:{hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]}"
+
+    def add(self, source: dict) -> int:
+        """Add or merge a source and return its 1-based citation number."""
+        key = self.key(source)
+        position = self._index.get(key)
+
+        if position is None:
+            self._sources.append(dict(source))
+            self._index[key] = len(self._sources) - 1
+            return len(self._sources)
+
+        existing = self._sources[position]
+        for field in ("snippet", "content"):
+            if len(str(source.get(field) or "")) > len(str(existing.get(field) or "")):
+                existing[field] = source[field]
+        if _score(source) > _score(existing):
+            existing["score"] = source["score"]
+        for field, value in source.items():
+            if value and not existing.get(field):
+                existing[field] = value
+
+        return position + 1
+
+    def citation_number(self, source: dict) -> Optional[int]:
+        """Citation number of a source already in the registry, or None."""
+        position = self._index.get(self.key(source))
+        return None if position is None else position + 1
+
+    def to_list(self) -> List[dict]:
+        """All sources in citation order."""
+        return list(self._sources)
+
+    def __len__(self) -> int:
+        return len(self._sources)
@@ -0,0 +1,56 @@
+"""
+Shared fixtures for the offline test suite.
+
+Tests never reach the network or the user's caches: the search, LLM and
+checkpoint stores are disabled unless a test opens its own under tmp_path,
+and the `fakes` fixture swaps get_llm and the Tavily clients for the
+scripted stand-ins in benchmarks.fakes.
+"""
+import importlib
+import pytest
+from benchmarks.fakes import FakeChatModel, FakeTavilyClient, FakeAsyncTavilyClient, LatencyModel
+from benchmarks.run import LLM_PATCH_TARGETS
+from src.state.schema import SubagentTask
+
+
+@pytest.fixture(autouse=True)
+def offline_env(monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_DISABLED", "1")
+    monkeypatch.setenv("LLM_CACHE_DISABLED", "1")
+    monkeypatch.setenv("RESEARCH_CHECKPOINT_DISABLED", "1")
+    monkeypatch.setenv("TAVILY_API_KEY", "offline-tests")
+    for name in ("LLM_SEMANTIC_CACHE", "TAVILY_REQUESTS_PER_SECOND", "OPENAI_REQUESTS_PER_SECOND",
+                 "SUBAGENT_TIMEOUT", "ITERATION_TIMEOUT", "SUBAGENT_MAX_RETRIES"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.fixture
+def fakes(monkeypatch):
+    """Point every LLM and Tavily entry point at the scripted fakes."""
+    import src.tools.search as search
+
+    model = FakeChatModel(latency=LatencyModel("fixed:0"), subagents=2, searches_per_subagent=2)
+    for name in LLM_PATCH_TARGETS:
+        monkeypatch.setattr(importlib.import_module(name), "get_llm", lambda *args, **kwargs: model)
+
+    sync_client = FakeTavilyClient()
+    async_client = FakeAsyncTavilyClient()
+    monkeypatch.setattr(search, "get_tavily_client", lambda: sync_client)
+    monkeypatch.setattr(search, "get_async_tavily_client", lambda: async_client)
+    return {"model": model, "sync_search": sync_client, "async_search": async_client}
+
+
+@pytest.fixture
+def make_task():
+    """Build numbered subagent tasks: make_task(n, priority)."""
+    def build(n: int = 0, priority: int = 0) -> SubagentTask:
+        return SubagentTask(
+            task_id=f"task{n}",
+            objective=f"Investigate facet {n}",
+            search_strategy="broad",
+            output_format="Bullet points",
+            tool_guidance="search_web_with_sources",
+            boundaries=f"Only facet {n}",
+            priority=priority
+        )
+    return build
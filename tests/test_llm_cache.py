@@ -0,0 +1,75 @@
+"""LLM response caches."""
+import json
+from datetime import datetime, timedelta
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration
+from src.utils.llm_cache import SQLiteLLMCache, SemanticLLMCache
+
+
+def _generations(text: str) -> list:
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def _react_prompt(task: str, results: str, when: datetime) -> str:
+    """A subagent ReAct turn as chat models hand it to the cache."""
+    return dumps([
+        SystemMessage(content=f"You are a research subagent. Current date: {when.isoformat()}"),
+        HumanMessage(content=f"Research task: {task}"),
+        AIMessage(content="", tool_calls=[{"name": "search_web", "args": {"query": task}, "id": "call_1"}]),
+        ToolMessage(content=results, tool_call_id="call_1", name="search_web"),
+    ])
+
+
+RESULTS = json.dumps([
+    {"title": f"Battery storage costs {n}", "url": f"https://example.com/{n}",
+     "content": "Lithium-ion pack prices fell while grid-scale deployments grew across markets. " * 3}
+    for n in range(5)
+])
+
+
+def test_exact_cache_matches_prompt_and_model_settings(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "llm.sqlite"))
+    cache.update("prompt", "gpt-4o t=0.7", _generations("answer"))
+
+    cached = cache.lookup("prompt", "gpt-4o t=0.7")
+    assert [g.message.content for g in cached] == ["answer"]
+    assert cache.lookup("prompt", "gpt-4o t=0.2") is None
+    assert cache.lookup("other prompt", "gpt-4o t=0.7") is None
+
+
+def test_exact_cache_persists_across_connections(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    SQLiteLLMCache(path).update("prompt", "model", _generations("answer"))
+    assert SQLiteLLMCache(path).lookup("prompt", "model")[0].message.content == "answer"
+
+
+def test_semantic_cache_serves_a_turn_that_differs_only_in_timestamp(tmp_path):
+    cache = SemanticLLMCache(str(tmp_path / "semantic.sqlite"))
+    now = datetime(2026, 1, 5, 9, 30)
+    cache.update(_react_prompt("grid-scale battery costs", RESULTS, now), "model", _generations("cached"))
+
+    later = _react_prompt("grid-scale battery costs", RESULTS, now + timedelta(hours=3))
+    cached = cache.lookup(later, "model")
+    assert cached is not None and cached[0].message.content == "cached"
+
+
+def test_semantic_cache_never_crosses_tasks_or_models(tmp_path):
+    cache = SemanticLLMCache(str(tmp_path / "semantic.sqlite"))
+    now = datetime(2026, 1, 5, 9, 30)
+    cache.update(_react_prompt("grid-scale battery costs", RESULTS, now), "model", _generations("cached"))
+
+    assert cache.lookup(_react_prompt("pumped hydro costs", RESULTS, now), "model") is None
+    assert cache.lookup(_react_prompt("grid-scale battery costs", RESULTS, now), "other-model") is None
+
+
+def test_semantic_cache_misses_on_different_search_results(tmp_path):
+    cache = SemanticLLMCache(str(tmp_path / "semantic.sqlite"))
+    now = datetime(2026, 1, 5, 9, 30)
+    cache.update(_react_prompt("grid-scale battery costs", RESULTS, now), "model", _generations("cached"))
+
+    other_results = json.dumps([
+        {"title": "Pumped hydro round-trip efficiency", "url": "https://example.org/hydro",
+         "content": "Reservoir pairs with elevation differences store energy for long durations. " * 3}
+    ])
+    assert cache.lookup(_react_prompt("grid-scale battery costs", other_results, now), "model") is None
@@ -0,0 +1,46 @@
+"""Chat model registry."""
+import asyncio
+import pytest
+from src.utils import llm_provider
+from src.utils.llm_provider import aclose_llms, close_llms, get_llm
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "offline-tests")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "offline-tests")
+    monkeypatch.setattr(llm_provider, "_registry", {})
+
+
+def test_same_configuration_shares_one_instance():
+    assert get_llm("openai", temperature=0.2) is get_llm("openai", temperature=0.2)
+    assert get_llm("openai", temperature=0.2) is not get_llm("openai", temperature=0.7)
+
+
+def test_unhashable_kwargs_are_rejected():
+    with pytest.raises(TypeError, match="hashable"):
+        get_llm("openai", default_headers={"x-trace": bytearray(b"id")})
+
+
+def _http_client(llm):
+    """The httpx client under a model's sync SDK client (Anthropic opens it on first use)."""
+    sdk = llm.root_client if hasattr(llm, "root_client") else llm._client
+    return sdk._client
+
+
+@pytest.mark.parametrize("provider", ["openai", "anthropic"])
+def test_models_built_after_close_llms_still_work(provider):
+    _http_client(get_llm(provider))
+    close_llms()
+
+    assert not _http_client(get_llm(provider)).is_closed
+
+
+def test_models_built_after_aclose_llms_still_work():
+    llm = get_llm("openai")
+    asyncio.run(aclose_llms())
+
+    fresh = get_llm("openai")
+    assert fresh is not llm
+    assert not fresh.root_client._client.is_closed
+    assert not fresh.root_async_client._client.is_closed
@@ -0,0 +1,132 @@
+"""Progress journal and its sidecar index."""
+import os
+import json
+from src.state.schema import SubagentResult
+from src.utils.memory import MemoryStore
+
+
+def _result(task_id: str, findings: str = "Findings.") -> SubagentResult:
+    return SubagentResult(
+        task_id=task_id,
+        findings=findings,
+        sources=[{"url": "https://example.com", "title": "Example"}],
+        confidence=0.5
+    )
+
+
+def _index(memory: MemoryStore) -> list:
+    with open(memory.progress_index_file) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _read(memory: MemoryStore, entry: dict) -> str:
+    with open(memory.progress_file, "rb") as f:
+        f.seek(entry["offset"])
+        return f.read(entry["length"]).decode("utf-8")
+
+
+def test_index_entries_cover_each_iteration(tmp_path):
+    memory = MemoryStore(str(tmp_path), "s1")
+    for iteration in (1, 2, 3):
+        memory.update_progress(iteration, [_result(f"t{iteration}")], f"synthesis {iteration}")
+
+    entries = _index(memory)
+    assert [entry["iteration"] for entry in entries] == [1, 2, 3]
+    for iteration, entry in enumerate(entries, 1):
+        section = _read(memory, entry)
+        assert section.startswith(f"\n## Iteration {iteration}\n")
+        assert f"synthesis {iteration}" in section
+    assert entries[-1]["offset"] + entries[-1]["length"] == os.path.getsize(memory.progress_file)
+
+
+def test_get_context_keeps_the_last_two_iterations(tmp_path):
+    memory = MemoryStore(str(tmp_path), "s1")
+    for iteration in (1, 2, 3):
+        memory.update_progress(iteration, [_result(f"t{iteration}")], f"synthesis {iteration}")
+
+    context = memory.get_context()
+    assert "Last 2 Iterations" in context
+    assert "## Iteration 2" in context and "## Iteration 3" in context
+    assert "## Iteration 1" not in context
+
+
+def test_get_context_returns_only_the_requested_iterations(tmp_path):
+    memory = MemoryStore(str(tmp_path), "s1")
+    for iteration in (1, 2, 3):
+        memory.update_progress(iteration, [_result(f"t{iteration}")], f"synthesis {iteration}")
+
+    context = memory.get_context(1)
+    assert "Last 1 Iterations" in context
+    assert "## Iteration 3" in context
+    assert "## Iteration 2" not in context
+
+
+def test_legacy_journal_gets_an_index(tmp_path):
+    memory = MemoryStore(str(tmp_path), "s1")
+    memory.update_progress(1, [_result("t1")], "synthesis 1")
+    memory.update_progress(2, [_result("t2")], "synthesis 2")
+    os.remove(memory.progress_index_file)
+
+    memory.update_progress(3, [_result("t3")], "synthesis 3")
+    assert [entry["iteration"] for entry in _index(memory)] == [1, 2, 3]
+
+
+def test_stale_index_falls_back_to_scanning(tmp_path):
+    memory = MemoryStore(str(tmp_path), "s1")
+    memory.update_progress(1, [_result("t1")], "synthesis 1")
+    memory.update_progress(2, [_result("t2")], "synthesis 2")
+    # An iteration the index does not know about
+    with open(memory.progress_file, "a") as f:
+        f.write("\n## Iteration 3\nunindexed findings\n")
+
+    context = memory.get_context(1)
+    assert "## Iteration 3" in context and "unindexed findings" in context
+    assert "## Iteration 2" not in context
+
+
+def test_streamed_iteration_is_indexed_from_its_header(tmp_path):
+    # A finding that contains the iteration marker must not move the indexed offset
+    memory = MemoryStore(str(tmp_path), "s1")
+    for iteration in (1, 2, 3):
+        offset = memory.begin_iteration(iteration)
+        memory.append_result(_result(f"t{iteration}", "Intro\n## Iteration notes\nmore"))
+        memory.finish_iteration(iteration, offset, f"synthesis {iteration}")
+
+    entry = _index(memory)[-1]
+    assert _read(memory, entry).startswith("\n## Iteration 3\n")
+    context = memory.get_context(1)
+    assert "## Iteration 3" in context and "#### t3" in context
+
+
+def test_get_context_zero_leaves_progress_out(tmp_path):
+    memory = MemoryStore(str(tmp_path), "s1")
+    memory.update_progress(1, [_result("t1")], "synthesis 1")
+    assert memory.get_context(0) == ""
+
+
+def test_rerun_iteration_reopens_its_unfinished_section(tmp_path):
+    memory = MemoryStore(str(tmp_path), "s1")
+    memory.update_progress(1, [_result("t1")], "synthesis 1")
+    offset = memory.begin_iteration(2)
+    memory.append_result(_result("t2"))
+
+    # A retry or resume of the node that opened iteration 2
+    assert memory.begin_iteration(2) == offset
+    assert memory.recorded_task_ids(offset) == {"t2"}
+    memory.append_result(_result("t3"))
+    memory.finish_iteration(2, offset, "synthesis 2")
+
+    with open(memory.progress_file) as f:
+        journal = f.read()
+    assert journal.count("\n## Iteration 2\n") == 1
+    assert [entry["iteration"] for entry in _index(memory)] == [1, 2]
+    assert memory.recorded_task_ids(offset) == {"t2", "t3"}
+
+
+def test_finished_iteration_is_not_reopened(tmp_path):
+    memory = MemoryStore(str(tmp_path), "s1")
+    memory.update_progress(1, [_result("t1")], "synthesis 1")
+    offset = memory.begin_iteration(2)
+
+    assert memory.begin_iteration(3) != offset
+    assert memory.recorded_task_ids(memory.begin_iteration(3)) == set()
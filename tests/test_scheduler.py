@@ -0,0 +1,90 @@
+"""Subagent scheduling: ordering, retries, deadlines and partial results."""
+import asyncio
+from benchmarks.fakes import LatencyModel
+from src.agents import subagent
+from src.agents.subagent import SubagentScheduler
+from src.state.schema import SubagentResult
+
+
+def test_results_come_back_in_task_order(monkeypatch, make_task):
+    async def execute(task, *args, **kwargs):
+        # Later tasks finish first
+        await asyncio.sleep(0.01 * (3 - int(task.task_id[-1])))
+        return SubagentResult(task_id=task.task_id, findings="", confidence=1.0)
+
+    monkeypatch.setattr(subagent, "execute_subagent_task", execute)
+    results = asyncio.run(SubagentScheduler(max_concurrency=3).run([make_task(n) for n in range(3)]))
+
+    assert [r.task_id for r in results] == ["task0", "task1", "task2"]
+
+
+def test_higher_priority_tasks_start_first(monkeypatch, make_task):
+    started = []
+
+    async def execute(task, *args, **kwargs):
+        started.append(task.task_id)
+        return SubagentResult(task_id=task.task_id, findings="", confidence=1.0)
+
+    monkeypatch.setattr(subagent, "execute_subagent_task", execute)
+    tasks = [make_task(0), make_task(1, priority=5), make_task(2, priority=1)]
+    asyncio.run(SubagentScheduler(max_concurrency=1).run(tasks))
+
+    assert started == ["task1", "task2", "task0"]
+
+
+def test_failed_subagent_is_retried(monkeypatch, make_task):
+    attempts = []
+
+    async def execute(task, *args, **kwargs):
+        attempts.append(task.task_id)
+        if len(attempts) < 3:
+            raise RuntimeError("provider error")
+        return SubagentResult(task_id=task.task_id, findings="done", confidence=1.0)
+
+    monkeypatch.setattr(subagent, "execute_subagent_task", execute)
+    results = asyncio.run(SubagentScheduler(max_retries=2, base_delay=0).run([make_task()]))
+
+    assert len(attempts) == 3
+    assert results[0].findings == "done"
+
+
+def test_retries_give_up_with_an_error_result(monkeypatch, make_task):
+    async def execute(task, *args, **kwargs):
+        raise RuntimeError("provider error")
+
+    monkeypatch.setattr(subagent, "execute_subagent_task", execute)
+    results = asyncio.run(SubagentScheduler(max_retries=1, base_delay=0).run([make_task()]))
+
+    assert results[0].confidence == 0.0
+    assert results[0].findings == "Error: provider error"
+    assert results[0].gaps == ["Subagent execution failed"]
+
+
+def test_fake_subagents_return_sourced_findings(fakes, make_task):
+    results = asyncio.run(SubagentScheduler(max_concurrency=2).run([make_task(n) for n in range(3)]))
+
+    assert all(r.sources and r.confidence == 0.8 for r in results)
+    assert fakes["async_search"].calls > 0
+
+
+def test_task_deadline_returns_partial_result_with_gathered_sources(fakes, make_task):
+    # The first turn searches; the second is still running at the deadline
+    fakes["model"].latency = LatencyModel("fixed:0.2")
+    scheduler = SubagentScheduler(task_timeout=0.3)
+
+    results = asyncio.run(scheduler.run([make_task()]))
+
+    assert results[0].gaps[0].startswith("Subagent stopped early: timed out after 0.3s")
+    assert results[0].sources
+    assert all(source["url"].startswith("https://example.com/") for source in results[0].sources)
+
+
+def test_iteration_deadline_cuts_off_running_and_waiting_tasks(fakes, make_task):
+    fakes["model"].latency = LatencyModel("fixed:0.2")
+    scheduler = SubagentScheduler(max_concurrency=1, iteration_timeout=0.3)
+
+    results = asyncio.run(scheduler.run([make_task(0), make_task(1)]))
+
+    assert results[0].gaps[0] == "Subagent stopped early: iteration deadline reached"
+    assert results[1].gaps == ["Subagent not run: iteration deadline reached"]
+    assert results[1].findings == "Not started before the iteration deadline."
@@ -0,0 +1,21 @@
+"""State reducers."""
+from src.state.schema import SubagentResult, merge_subagent_results
+
+
+def _result(task_id: str) -> SubagentResult:
+    return SubagentResult(task_id=task_id, findings="", confidence=0.5)
+
+
+def test_merge_subagent_results_appends_fanned_out_results():
+    merged = merge_subagent_results([_result("a")], [_result("b")])
+    merged = merge_subagent_results(merged, [_result("c")])
+    assert [r.task_id for r in merged] == ["a", "b", "c"]
+
+
+def test_merge_subagent_results_starts_from_nothing():
+    assert [r.task_id for r in merge_subagent_results(None, [_result("a")])] == ["a"]
+
+
+def test_merge_subagent_results_none_clears():
+    assert merge_subagent_results([_result("a"), _result("b")], None) == []
+    assert merge_subagent_results(None, None) == []
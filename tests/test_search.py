@@ -0,0 +1,64 @@
+"""Session-scoped reuse of rephrased searches."""
+from collections import OrderedDict
+import pytest
+from src.tools import search
+from src.tools.search import RephraseIndex, cached_search, rephrased_search_scope
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(monkeypatch):
+    monkeypatch.setattr(search, "_rephrase_indexes", OrderedDict())
+
+
+def _calls(fakes, *queries, session="s1", **params) -> int:
+    with rephrased_search_scope(session):
+        for query in queries:
+            cached_search(query, **params)
+    return fakes["sync_search"].calls
+
+
+@pytest.mark.parametrize("first, second", [
+    ("X pricing 2025", "pricing of X in 2025"),
+    ("grid storage costs", "cost of grid storage"),
+    ("grid storage cost", "grid storage cost cost"),
+])
+def test_rephrasings_reuse_the_earlier_search(fakes, first, second):
+    assert _calls(fakes, first, second) == 1
+
+
+@pytest.mark.parametrize("first, second", [
+    ("climate change effects on coral reefs", "climate change effects on coral reef fish"),
+    ("revenue 2024", "revenue 2025"),
+])
+def test_changed_content_words_reach_tavily(fakes, first, second):
+    assert _calls(fakes, first, second) == 2
+
+
+def test_search_parameters_are_part_of_the_key(fakes):
+    with rephrased_search_scope("s1"):
+        cached_search("X pricing 2025", max_results=5)
+        cached_search("pricing of X in 2025", max_results=10)
+    assert fakes["sync_search"].calls == 2
+
+
+def test_rephrasings_are_only_reused_within_a_scoped_session(fakes):
+    _calls(fakes, "X pricing 2025", session="s1")
+    _calls(fakes, "pricing of X in 2025", session="s2")
+    cached_search("pricing of X in 2025")
+    assert fakes["sync_search"].calls == 3
+
+
+def test_disabled_reuse_calls_tavily_every_time(fakes, monkeypatch):
+    monkeypatch.setenv("SEARCH_REPHRASE_CACHE_DISABLED", "1")
+    assert _calls(fakes, "X pricing 2025", "pricing of X in 2025") == 2
+
+
+def test_index_drops_the_least_recently_used_search():
+    index = RephraseIndex(max_entries=2)
+    index.set("a", {"n": 1})
+    index.set("b", {"n": 2})
+    index.get("a")
+    index.set("c", {"n": 3})
+    assert len(index) == 2
+    assert index.get("b") is None
+    assert index.get("a") == {"n": 1}
@@ -0,0 +1,35 @@
+"""Persistent Tavily search cache."""
+from src.tools.cache import SearchCache, make_cache_key
+
+
+def test_key_ignores_case_and_whitespace():
+    assert make_cache_key("  Grid   Storage ", 5, "advanced", False) == make_cache_key("grid storage", 5, "advanced", False)
+    assert make_cache_key("grid storage", 5, "advanced", False) != make_cache_key("grid storage", 10, "advanced", False)
+
+
+def test_round_trip_persists_across_connections(tmp_path):
+    path = str(tmp_path / "search.sqlite")
+    cache = SearchCache(path)
+    cache.set("k", {"results": [{"url": "https://example.com"}]})
+    cache.close()
+
+    reopened = SearchCache(path)
+    assert reopened.get("k") == {"results": [{"url": "https://example.com"}]}
+    assert reopened.get("missing") is None
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = SearchCache(str(tmp_path / "search.sqlite"), ttl=-1)
+    cache.set("k", {"results": []})
+    assert cache.get("k") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SearchCache(str(tmp_path / "search.sqlite"), max_entries=2)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", {"n": 3})
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("b") is None
+    assert cache.get("c") == {"n": 3}
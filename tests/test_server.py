@@ -0,0 +1,98 @@
+"""Research server admission control and sessions."""
+import os
+import asyncio
+from types import SimpleNamespace
+import pytest
+from src.server import ResearchServer
+
+
+class BlockingGraph:
+    """Graph stand-in whose sessions run until released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def astream(self, graph_input, config=None, stream_mode=None):
+        await self.release.wait()
+        yield "updates", {"citation_agent": {}}
+
+    async def aget_state(self, config):
+        return SimpleNamespace(values={})
+
+
+@pytest.mark.parametrize("session_id", ["../../escape", "/tmp/abs", "a" * 65, 42, "has space"])
+def test_unsafe_session_ids_are_rejected(tmp_path, session_id):
+    events = []
+
+    async def main():
+        server = ResearchServer(BlockingGraph(), str(tmp_path), events.append)
+        assert server.submit({"id": 1, "query": "q", "session_id": session_id}) is None
+
+    asyncio.run(main())
+    assert [event["event"] for event in events] == ["rejected"]
+    assert "session_id" in events[0]["reason"]
+
+
+def test_query_is_required_unless_resuming(tmp_path):
+    events = []
+
+    async def main():
+        server = ResearchServer(BlockingGraph(), str(tmp_path), events.append)
+        server.submit({"id": 1})
+
+    asyncio.run(main())
+    assert events[0]["event"] == "rejected"
+    assert "query is required" in events[0]["reason"]
+
+
+def test_pending_limit_and_duplicate_sessions_are_rejected(tmp_path):
+    events = []
+
+    async def main():
+        graph = BlockingGraph()
+        server = ResearchServer(graph, str(tmp_path), events.append, max_sessions=1, max_pending=2)
+        server.submit({"id": 1, "query": "q", "session_id": "s1"})
+        server.submit({"id": 2, "query": "q", "session_id": "s1"})
+        server.submit({"id": 3, "query": "q", "session_id": "s2"})
+        server.submit({"id": 4, "query": "q", "session_id": "s3"})
+        await asyncio.sleep(0.05)
+        started = [event["session_id"] for event in events if event["event"] == "started"]
+        graph.release.set()
+        await server.drain()
+        return started
+
+    started = asyncio.run(main())
+    outcome = {event["id"]: event["event"] for event in events if event["event"] in ("accepted", "rejected")}
+    assert outcome == {1: "accepted", 2: "rejected", 3: "accepted", 4: "rejected"}
+    # max_sessions=1: the second session waits for the first one's slot
+    assert started == ["s1"]
+    assert sorted(event["session_id"] for event in events if event["event"] == "done") == ["s1", "s2"]
+
+
+def test_resuming_an_unknown_session_reports_an_error(tmp_path):
+    events = []
+
+    async def main():
+        server = ResearchServer(BlockingGraph(), str(tmp_path), events.append)
+        server.submit({"id": 1, "resume": "missing"})
+        await server.drain()
+
+    asyncio.run(main())
+    assert events[-1]["event"] == "error"
+    assert "no checkpoint found" in events[-1]["error"]
+
+
+def test_session_runs_the_graph_into_its_own_directory(tmp_path, fakes):
+    from src.graph.workflow import build_graph
+    events = []
+
+    async def main():
+        server = ResearchServer(build_graph(), str(tmp_path), events.append)
+        server.submit({"id": 1, "query": "Grid-scale storage economics", "session_id": "s1", "max_iterations": 1})
+        await server.drain()
+
+    asyncio.run(main())
+    done = events[-1]
+    assert done["event"] == "done", events
+    assert done["report"] == os.path.join(str(tmp_path), "s1", "final_report_s1.md")
+    assert os.path.exists(done["report"])
@@ -0,0 +1,102 @@
+"""In-flight request coalescing."""
+import time
+import asyncio
+import threading
+import pytest
+from src.tools.singleflight import SingleFlight
+
+
+def test_concurrent_sync_calls_share_one_call():
+    flight = SingleFlight("test")
+    calls = []
+    barrier = threading.Barrier(5)
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return "response"
+
+    def caller():
+        barrier.wait()
+        results.append(flight.do("key", fetch))
+
+    threads = [threading.Thread(target=caller) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["response"] * 5
+
+
+def test_sync_exception_reaches_every_waiter():
+    flight = SingleFlight("test")
+    started = threading.Event()
+    errors = []
+
+    def fetch():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("boom")
+
+    def caller():
+        try:
+            flight.do("key", fetch)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=caller)
+    follower.start()
+    leader.join()
+    follower.join()
+
+    assert errors == ["boom", "boom"]
+
+
+def test_sync_calls_after_completion_run_again():
+    flight = SingleFlight("test")
+    calls = []
+    flight.do("key", lambda: calls.append(1))
+    flight.do("key", lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+def test_concurrent_async_calls_share_one_call():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "response"
+
+    async def main():
+        return await asyncio.gather(*(flight.ado("key", fetch) for _ in range(5)), flight.ado("other", fetch))
+
+    assert asyncio.run(main()) == ["response"] * 6
+    assert len(calls) == 2
+
+
+def test_cancelled_async_caller_does_not_cancel_the_shared_call():
+    flight = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "response"
+
+    async def main():
+        leader = asyncio.create_task(flight.ado("key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "response"
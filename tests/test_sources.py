@@ -0,0 +1,42 @@
+"""Source deduplication."""
+from src.utils.sources import SourceRegistry, normalize_url
+
+
+def test_normalize_url_drops_tracking_fragments_and_trailing_slashes():
+    assert normalize_url("HTTPS://Example.com:443/page/?utm_source=x&b=2&a=1#top") == "https://example.com/page?a=1&b=2"
+
+
+def test_registry_merges_urls_that_normalize_equal():
+    registry = SourceRegistry()
+    first = registry.add({"url": "https://Example.com/page/?utm_source=x", "title": "Page", "snippet": "short", "score": 0.2})
+    second = registry.add({"url": "https://example.com/page#top", "title": "Page", "snippet": "a longer snippet", "score": 0.9})
+
+    assert first == second == 1
+    assert registry.to_list() == [
+        {"url": "https://Example.com/page/?utm_source=x", "title": "Page", "snippet": "a longer snippet", "score": 0.9}
+    ]
+
+
+def test_citation_numbers_follow_first_seen_order():
+    registry = SourceRegistry([{"url": "https://a.example"}, {"url": "https://b.example"}, {"url": "https://a.example/"}])
+    assert len(registry) == 2
+    assert registry.citation_number({"url": "https://b.example"}) == 2
+    assert registry.citation_number({"url": "https://c.example"}) is None
+
+
+def test_url_less_sources_from_different_searches_stay_apart():
+    registry = SourceRegistry([
+        {"title": "AI Summary", "url": "", "content": "Batteries got cheaper."},
+        {"title": "AI Summary", "url": "", "content": "Hydro is long-duration."},
+        {"title": "AI Summary", "url": "", "content": "Batteries got cheaper."},
+    ])
+    assert [source["content"] for source in registry.to_list()] == [
+        "Batteries got cheaper.", "Hydro is long-duration."
+    ]
+
+
+def test_ref_parameter_that_selects_content_is_kept():
+    main = "https://github.com/org/repo/blob/README.md?ref=main"
+    dev = "https://github.com/org/repo/blob/README.md?ref=dev"
+    assert normalize_url(main) != normalize_url(dev)
+    assert len(SourceRegistry([{"url": main}, {"url": dev}])) == 2
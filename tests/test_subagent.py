@@ -0,0 +1,94 @@
+"""ReAct subagent budgets and step limits."""
+import time
+import asyncio
+from langchain_core.messages import AIMessage
+from src.agents.subagent import (
+    STEP_LIMIT_REPLY, BudgetController, SubagentProgress, _run_agent, execute_subagent_task, subagent_node
+)
+from src.state.schema import SubagentBudget
+
+LOOSE_BUDGET = SubagentBudget(max_tool_calls=10, max_tokens=10**9, max_seconds=600, max_context_tokens=10**9)
+
+
+def test_whole_tool_budget_fits_in_the_step_limit(fakes, make_task):
+    fakes["model"].searches_per_subagent = LOOSE_BUDGET.max_tool_calls
+
+    result = asyncio.run(execute_subagent_task(make_task(), budget=LOOSE_BUDGET))
+
+    assert result.profile["budget"]["tool_calls"] == LOOSE_BUDGET.max_tool_calls
+    assert result.profile["budget"]["exhausted"] is None
+    assert result.findings.startswith("Scripted findings.")
+    assert result.sources
+
+
+class StepLimitedAgent:
+    """ReAct agent stand-in that runs out of graph steps on its first turn."""
+
+    async def astream(self, graph_input, config=None, stream_mode=None):
+        yield {"messages": graph_input["messages"] + [AIMessage(content=STEP_LIMIT_REPLY)]}
+
+
+def test_step_limit_reply_forces_a_final_answer(fakes, make_task):
+    controller = BudgetController(LOOSE_BUDGET)
+    config = {"callbacks": [controller]}
+
+    content = asyncio.run(_run_agent(
+        StepLimitedAgent(), fakes["model"], "You are a research subagent.", make_task(),
+        config, controller, SubagentProgress()
+    ))
+
+    assert STEP_LIMIT_REPLY not in content
+    assert "Scripted findings." in content
+    assert controller.exhausted_reason == "step limit"
+
+
+def _fan_out_state(task, dispatched_at: float) -> dict:
+    return {
+        "task": task,
+        "budget": LOOSE_BUDGET,
+        "dispatched_at": dispatched_at,
+        "iteration_timeout": 900.0,
+        "provider": "openai",
+        "conversation_id": "s1",
+        "use_llm_cache": False
+    }
+
+
+def test_fan_out_past_its_iteration_deadline_does_no_work(fakes, make_task):
+    state = _fan_out_state(make_task(), dispatched_at=time.time() - 1000)
+
+    update = asyncio.run(subagent_node(state, {"configurable": {"thread_id": "s1"}}))
+
+    result = update["subagent_results"][0]
+    assert result.gaps == ["Subagent stopped early: iteration deadline reached"]
+    assert result.sources == []
+    assert fakes["async_search"].calls == 0
+
+
+def test_resumed_fan_out_restarts_the_iteration_clock(fakes, make_task):
+    # Dispatched by a run that was interrupted longer ago than ITERATION_TIMEOUT
+    state = _fan_out_state(make_task(), dispatched_at=time.time() - 1000)
+    config = {"configurable": {"thread_id": "s1", "run_started_at": time.time()}}
+
+    update = asyncio.run(subagent_node(state, config))
+
+    result = update["subagent_results"][0]
+    assert result.gaps == []
+    assert result.findings.startswith("Scripted findings.")
+
+
+def test_replayed_iteration_journals_each_task_once(tmp_path, fakes, make_task):
+    from src.agents.subagent import stream_subagents
+    from src.utils.memory import MemoryStore
+    tasks = [make_task(1), make_task(2)]
+    state = {"iteration_count": 1, "output_dir": str(tmp_path), "conversation_id": "s1"}
+
+    # The second run stands in for a retry or checkpoint resume of the executor node
+    offsets = [asyncio.run(stream_subagents(state, tasks, LOOSE_BUDGET, lambda _: None))[3] for _ in range(2)]
+
+    assert offsets[0] == offsets[1]
+    memory = MemoryStore(str(tmp_path), "s1")
+    with open(memory.progress_file) as f:
+        journal = f.read()
+    assert journal.count("\n## Iteration 1\n") == 1
+    assert journal.count("\n#### task1\n") == 1 and journal.count("\n#### task2\n") == 1